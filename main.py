@@ -13,7 +13,10 @@ from napkon_string_matching.misc import (
     convert_validated_mapping_to_json,
     generate_combined_mapping,
     generate_mapping_result_table,
+    print_cache_statistics,
     print_statistics,
+    prune_cache,
+    sweep_score_thresholds,
 )
 
 logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
@@ -25,6 +28,7 @@ def get_args():
 
     parser.add_argument("--config", default="config.yml")
     parser.add_argument("--no-cache", action="store_true", default=False)
+    parser.add_argument("--workers", type=int, help="number of processes used for scoring")
 
     parser.add_argument("--convert-validated-mapping", help="XLSX file to be converted")
     parser.add_argument("--id-reference", help="file to look up ids for mappings")
@@ -36,6 +40,24 @@ def get_args():
     parser.add_argument("--output-name")
 
     parser.add_argument("--print-statistics", action="store_true")
+    parser.add_argument("--cache-stats", action="store_true", help="print cache statistics")
+    parser.add_argument(
+        "--cache-prune",
+        action="store_true",
+        help="remove least recently used cache entries exceeding the cache budget",
+    )
+    parser.add_argument(
+        "--sweep-thresholds",
+        type=float,
+        nargs="+",
+        metavar="THRESHOLD",
+        help="report the results for each score threshold from one scoring run",
+    )
+    parser.add_argument(
+        "--write-sweep-results",
+        action="store_true",
+        help="write the results for each threshold of --sweep-thresholds",
+    )
 
     args = parser.parse_args()
     return args
@@ -45,6 +67,8 @@ if __name__ == "__main__":
     args = get_args()
 
     config = yaml.safe_load(Path(args.config).read_text())
+    if args.workers:
+        config[matching.CONFIG_FIELD_MATCHING]["workers"] = args.workers
 
     if args.convert_validated_mapping:
         logger.info("convert validated matching to JSON")
@@ -61,6 +85,13 @@ if __name__ == "__main__":
         )
     elif args.print_statistics:
         print_statistics(config)
+    elif args.cache_stats:
+        print_cache_statistics(config)
+    elif args.cache_prune:
+        prune_cache(config)
+    elif args.sweep_thresholds:
+        logger.info("sweep score thresholds")
+        sweep_score_thresholds(config, args.sweep_thresholds, args.write_sweep_results)
     else:
         logger.info("generate matching")
         matching.match(config, use_cache=not args.no_cache)
@@ -0,0 +1,150 @@
+import json
+import logging
+from dataclasses import dataclass, field
+from hashlib import md5
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+ARTIFACTS_FILE = "artifacts.json"
+
+RECORD_INPUTS = "inputs"
+RECORD_CONFIG = "config"
+
+HASH_CHUNK_SIZE = 1 << 20
+
+
+@dataclass
+class Artifact:
+    """
+    File derived from source files and other artifacts
+
+    Attributes
+    ---
+        target (Path):              file the artifact is stored in
+        build (Callable):           builds the artifact, called with the values of all input
+                                    artifacts in the order of `inputs`
+        load (Callable):            reads the artifact from `target`
+        save (Callable):            writes a value of the artifact to `target`
+        inputs (List):              source files or other artifacts the artifact is built from
+        config (Any):               configuration the artifact is built with, serialized as
+                                    JSON
+    """
+
+    target: Path
+    build: Callable[..., Any]
+    load: Callable[[Path], Any]
+    save: Callable[[Any, Path], None]
+    inputs: List["Path | Artifact"] = field(default_factory=list)
+    config: Any = None
+
+
+class ArtifactGraph:
+    """
+    Make-like rebuild of artifacts. For every artifact the content hashes of its inputs and the
+    configuration it was built with are recorded in `artifacts.json` next to it. An artifact is
+    only rebuilt if it does not exist, its inputs or configuration changed or its input
+    artifacts had to be rebuilt with a different content.
+
+    If source files of an existing artifact are missing, the artifact is used as it is.
+
+    Attributes
+    ---
+        use_cache (bool):   if `False` all artifacts are built and nothing is written
+    """
+
+    def __init__(self, use_cache: bool = True) -> None:
+        self.use_cache = use_cache
+        self._values: Dict[Path, Any] = {}
+        self._hashes: Dict[Path, str] = {}
+
+    def get(self, artifact: Artifact) -> Any:
+        """
+        Get the value of the `artifact`, rebuilding it and its inputs if out of date
+        """
+        self.update(artifact)
+
+        if artifact.target not in self._values:
+            logger.info("using previously cached %s", artifact.target.name)
+            self._values[artifact.target] = artifact.load(artifact.target)
+        return self._values[artifact.target]
+
+    def update(self, artifact: Artifact) -> None:
+        """
+        Rebuild the `artifact` and its inputs if out of date
+        """
+        for input in artifact.inputs:
+            if isinstance(input, Artifact):
+                self.update(input)
+
+        if artifact.target in self._values:
+            return
+        if self.use_cache and self.is_current(artifact):
+            return
+
+        logger.info("build %s", artifact.target.name)
+        value = artifact.build(
+            *[self.get(input) for input in artifact.inputs if isinstance(input, Artifact)]
+        )
+        self._values[artifact.target] = value
+
+        if self.use_cache and value is not None:
+            if not artifact.target.parent.exists():
+                artifact.target.parent.mkdir(parents=True)
+            artifact.save(value, artifact.target)
+            self._hashes.pop(artifact.target, None)
+            self._record(artifact)
+
+    def is_current(self, artifact: Artifact) -> bool:
+        if not artifact.target.exists():
+            return False
+
+        missing = [path for path in self._input_paths(artifact) if not path.exists()]
+        if missing:
+            logger.warning(
+                "using %s as it is, inputs not available: %s",
+                artifact.target.name,
+                ", ".join(str(path) for path in missing),
+            )
+            return True
+
+        record = self._read_records(artifact.target.parent).get(artifact.target.name)
+        return record == self._gen_record(artifact)
+
+    def _record(self, artifact: Artifact) -> None:
+        directory = artifact.target.parent
+        records = self._read_records(directory)
+        records[artifact.target.name] = self._gen_record(artifact)
+        (directory / ARTIFACTS_FILE).write_text(json.dumps(records, indent=4), encoding="utf-8")
+
+    def _gen_record(self, artifact: Artifact) -> Dict[str, Any]:
+        return {
+            RECORD_INPUTS: {str(path): self._hash(path) for path in self._input_paths(artifact)},
+            RECORD_CONFIG: md5(
+                json.dumps(artifact.config, sort_keys=True, default=str).encode("utf-8"),
+                usedforsecurity=False,
+            ).hexdigest(),
+        }
+
+    def _input_paths(self, artifact: Artifact) -> List[Path]:
+        return [
+            input.target if isinstance(input, Artifact) else Path(input)
+            for input in artifact.inputs
+        ]
+
+    def _hash(self, path: Path) -> str | None:
+        if not path.exists():
+            return None
+        if path not in self._hashes:
+            hash = md5(usedforsecurity=False)
+            with open(path, "rb") as file:
+                while chunk := file.read(HASH_CHUNK_SIZE):
+                    hash.update(chunk)
+            self._hashes[path] = hash.hexdigest()
+        return self._hashes[path]
+
+    @staticmethod
+    def _read_records(directory: Path) -> Dict[str, Dict]:
+        file = directory / ARTIFACTS_FILE
+        return json.loads(file.read_text(encoding="utf-8")) if file.exists() else {}
@@ -0,0 +1,220 @@
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from napkon_string_matching.cache.manager import CacheManager
+
+logger = logging.getLogger(__name__)
+
+METADATA_KEY = b"napkon_string_matching"
+METADATA_FIELD = "metadata"
+JSON_COLUMNS_FIELD = "json_columns"
+DATA_FIELD = "data"
+
+
+class CacheBackend:
+    """
+    Stores data frames in cache files of a certain format. Additional metadata given as
+    dictionary of strings can be stored alongside the frame.
+
+    If a `manager` is given, written files are recorded and reads are tracked as accesses.
+    Files belonging together can be recorded under the same `key`, they are evicted together.
+
+    Attributes
+    ---
+        manager (CacheManager|None):    manager keeping track of the cache files
+    """
+
+    suffix: str = None
+
+    def __init__(self, manager: CacheManager | None = None) -> None:
+        self.manager = manager
+
+    def write(
+        self,
+        df: pd.DataFrame,
+        file: Path,
+        metadata: Dict[str, str] | None = None,
+        key: Path | None = None,
+    ) -> None:
+        self._write(df, file, metadata)
+        if self.manager:
+            self.manager.record(key or file, file)
+
+    def read(self, file: Path, key: Path | None = None) -> Tuple[pd.DataFrame, Dict[str, str]]:
+        result = self._read(file)
+        if self.manager:
+            self.manager.touch(key or file)
+        return result
+
+    def _write(self, df: pd.DataFrame, file: Path, metadata: Dict[str, str] | None) -> None:
+        raise NotImplementedError()
+
+    def _read(self, file: Path) -> Tuple[pd.DataFrame, Dict[str, str]]:
+        raise NotImplementedError()
+
+    def path(self, file: str | Path) -> Path:
+        """
+        Get the path of the cache file using the suffix of this backend
+        """
+        return Path(file).with_suffix(self.suffix)
+
+
+class JsonBackend(CacheBackend):
+    """
+    Stores frames as JSON records, frames without metadata can also be read using `read_json`
+    """
+
+    suffix = ".json"
+
+    def _write(self, df: pd.DataFrame, file: Path, metadata: Dict[str, str] | None) -> None:
+        content = df.to_json(orient="records", indent=4)
+        if metadata:
+            content = json.dumps(
+                {METADATA_FIELD: metadata, DATA_FIELD: json.loads(content)}, indent=4
+            )
+        Path(file).write_text(content, encoding="utf-8")
+
+    def _read(self, file: Path) -> Tuple[pd.DataFrame, Dict[str, str]]:
+        content = json.loads(Path(file).read_text(encoding="utf-8"))
+        if isinstance(content, dict) and DATA_FIELD in content:
+            return pd.DataFrame(content[DATA_FIELD]), content[METADATA_FIELD]
+        return pd.DataFrame(content), {}
+
+
+class ArrowBackend(CacheBackend):
+    """
+    Stores frames in the Arrow IPC file format. List columns are stored natively, columns
+    that cannot be converted to a single Arrow type, e.g. lists mixing strings and lists, are
+    stored JSON encoded.
+
+    Attributes
+    ---
+        memory_map (bool):  read the files memory-mapped
+    """
+
+    suffix = ".arrow"
+
+    def __init__(self, memory_map: bool = True, manager: CacheManager | None = None) -> None:
+        super().__init__(manager=manager)
+        self.memory_map = memory_map
+
+    def _write(self, df: pd.DataFrame, file: Path, metadata: Dict[str, str] | None) -> None:
+        table = self._to_table(df, metadata)
+
+        with pa.OSFile(str(file), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+    def _read(self, file: Path) -> Tuple[pd.DataFrame, Dict[str, str]]:
+        source = pa.memory_map(str(file)) if self.memory_map else pa.OSFile(str(file))
+        with source:
+            return self._from_table(pa.ipc.open_file(source).read_all())
+
+    @staticmethod
+    def _to_table(df: pd.DataFrame, metadata: Dict[str, str] | None):
+        arrays = []
+        json_columns = []
+        for name, column in df.items():
+            try:
+                arrays.append(pa.array(column, from_pandas=True))
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                json_columns.append(name)
+                arrays.append(pa.array([_encode(value) for value in column], type=pa.string()))
+
+        table = pa.Table.from_arrays(arrays, names=[str(name) for name in df.columns])
+        return table.replace_schema_metadata(
+            {
+                METADATA_KEY: json.dumps(
+                    {METADATA_FIELD: metadata or {}, JSON_COLUMNS_FIELD: json_columns}
+                )
+            }
+        )
+
+    @staticmethod
+    def _from_table(table) -> Tuple[pd.DataFrame, Dict[str, str]]:
+        schema_metadata = json.loads((table.schema.metadata or {}).get(METADATA_KEY, b"{}"))
+        json_columns: List[str] = schema_metadata.get(JSON_COLUMNS_FIELD, [])
+
+        columns = {}
+        for name, column in zip(table.column_names, table.columns):
+            if name in json_columns:
+                columns[name] = [_decode(value) for value in column.to_pylist()]
+            elif pa.types.is_list(column.type) or pa.types.is_large_list(column.type):
+                # Keep lists as Python lists instead of NumPy arrays
+                columns[name] = column.to_pylist()
+            else:
+                columns[name] = column.to_pandas()
+
+        df = pd.DataFrame(columns, columns=table.column_names)
+        return df, schema_metadata.get(METADATA_FIELD, {})
+
+
+class ParquetBackend(ArrowBackend):
+    """
+    Stores frames in the Parquet format, see `ArrowBackend`
+    """
+
+    suffix = ".parquet"
+
+    def _write(self, df: pd.DataFrame, file: Path, metadata: Dict[str, str] | None) -> None:
+        pq.write_table(self._to_table(df, metadata), str(file))
+
+    def _read(self, file: Path) -> Tuple[pd.DataFrame, Dict[str, str]]:
+        return self._from_table(pq.read_table(str(file), memory_map=self.memory_map))
+
+
+def get_cache_backend(
+    cache_format: str | None = None,
+    memory_map: bool = True,
+    manager: CacheManager | None = None,
+) -> CacheBackend:
+    """
+    Get the backend for the `cache_format`, defaults to JSON
+
+    Attributes
+    ---
+        cache_format (str|None):        json, parquet or arrow
+        memory_map (bool):              read binary files memory-mapped
+        manager (CacheManager|None):    manager keeping track of the cache files
+
+    Returns
+    ---
+        CacheBackend:   backend for the format
+    """
+    match cache_format:
+        case None | "json":
+            return JsonBackend(manager=manager)
+        case "parquet":
+            return ParquetBackend(memory_map=memory_map, manager=manager)
+        case "arrow":
+            return ArrowBackend(memory_map=memory_map, manager=manager)
+        case _:
+            raise ValueError(f"unknown cache format '{cache_format}'")
+
+
+def get_side_file(file: Path, side: str) -> Path:
+    """
+    Get the file storing the `side` of the data written to `file`, next to it
+    """
+    return file.with_name(f"{file.stem}_{side}{file.suffix}")
+
+
+def get_side_files(file: Path, *sides: str) -> List[Path]:
+    """
+    Get `file` and the files storing the `sides` of the data written to it
+    """
+    return [file, *(get_side_file(file, side) for side in sides)]
+
+
+def _encode(value) -> str | None:
+    return None if value is None else json.dumps(value)
+
+
+def _decode(value: str | None):
+    return None if value is None else json.loads(value)
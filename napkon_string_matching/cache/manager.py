@@ -0,0 +1,185 @@
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from napkon_string_matching.cache.artifacts import ARTIFACTS_FILE
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_TMP_FILE = "manifest.tmp"
+
+ENTRY_FILES = "files"
+ENTRY_SIZE = "size"
+ENTRY_CREATED = "created"
+ENTRY_ACCESSED = "accessed"
+
+
+class CacheManager:
+    """
+    Keeps track of the files in the cache directory using a manifest. Each entry records its
+    files, size, creation and last access time. If `max_bytes` is set, least recently used
+    entries are removed as soon as the cache grows beyond it.
+
+    Files in the cache directory that are not part of the manifest, e.g. written by older
+    versions, are added with their modification time when the manifest is loaded.
+
+    The manifest is read before and written after every change, so multiple instances can be
+    used for the same directory.
+
+    Attributes
+    ---
+        cache_dir (Path):       directory of the cache
+        max_bytes (int|None):   size budget of the cache in bytes
+    """
+
+    def __init__(self, cache_dir: str | Path, max_bytes: int | None = None) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    @property
+    def manifest_file(self) -> Path:
+        return self.cache_dir / MANIFEST_FILE
+
+    def record(self, key: str | Path, file: str | Path) -> None:
+        """
+        Record that `file` was written as part of the entry `key` and remove least recently used
+        entries if the budget is exceeded
+
+        Attributes
+        ---
+            key (str|Path):     entry the file belongs to
+            file (str|Path):    written file
+        """
+        manifest = self._load()
+        now = time.time()
+
+        key = self._name(key)
+        name = self._name(file)
+
+        # The file may have been picked up as untracked file when loading the manifest
+        if name != key:
+            manifest.pop(name, None)
+
+        entry = manifest.setdefault(key, {ENTRY_FILES: [], ENTRY_CREATED: now})
+        if name not in entry[ENTRY_FILES]:
+            entry[ENTRY_FILES].append(name)
+        entry[ENTRY_SIZE] = self._size(entry[ENTRY_FILES])
+        entry[ENTRY_ACCESSED] = now
+
+        if self.max_bytes is not None:
+            self._prune(manifest, self.max_bytes, keep=key)
+        self._save(manifest)
+
+    def touch(self, key: str | Path) -> None:
+        """
+        Record an access of the entry `key`
+        """
+        manifest = self._load()
+        if (entry := manifest.get(self._name(key))) is not None:
+            entry[ENTRY_ACCESSED] = time.time()
+            self._save(manifest)
+
+    def prune(self, max_bytes: int | None = None) -> List[str]:
+        """
+        Remove least recently used entries until the cache fits into `max_bytes`, defaults to
+        the budget of this manager
+
+        Returns
+        ---
+            List[str]:  keys of the removed entries
+        """
+        max_bytes = max_bytes if max_bytes is not None else self.max_bytes
+        manifest = self._load()
+        removed = self._prune(manifest, max_bytes) if max_bytes is not None else []
+        self._save(manifest)
+        return removed
+
+    def stats(self) -> Dict[str, int | float | None]:
+        """
+        Get the number of entries and files, the total size and the budget of the cache as well
+        as the oldest and newest access time
+        """
+        manifest = self._load()
+        accessed = [entry[ENTRY_ACCESSED] for entry in manifest.values()]
+        return {
+            "entries": len(manifest),
+            "files": sum(len(entry[ENTRY_FILES]) for entry in manifest.values()),
+            "size": sum(entry[ENTRY_SIZE] for entry in manifest.values()),
+            "max_bytes": self.max_bytes,
+            "oldest_access": min(accessed) if accessed else None,
+            "newest_access": max(accessed) if accessed else None,
+        }
+
+    def _prune(self, manifest: Dict[str, Dict], max_bytes: int, keep: str | None = None):
+        size = sum(entry[ENTRY_SIZE] for entry in manifest.values())
+
+        removed = []
+        for key in sorted(manifest, key=lambda key: manifest[key][ENTRY_ACCESSED]):
+            if size <= max_bytes:
+                break
+            if key == keep:
+                continue
+
+            entry = manifest.pop(key)
+            for name in entry[ENTRY_FILES]:
+                (self.cache_dir / name).unlink(missing_ok=True)
+            size -= entry[ENTRY_SIZE]
+            removed.append(key)
+            logger.info("removed cache entry %s (%s bytes)", key, "{:,}".format(entry[ENTRY_SIZE]))
+
+        return removed
+
+    def _load(self) -> Dict[str, Dict]:
+        manifest = (
+            json.loads(self.manifest_file.read_text(encoding="utf-8"))
+            if self.manifest_file.exists()
+            else {}
+        )
+
+        # Drop entries whose files were removed
+        manifest = {
+            key: entry
+            for key, entry in manifest.items()
+            if all((self.cache_dir / name).exists() for name in entry[ENTRY_FILES])
+        }
+
+        # Add files not tracked yet
+        if self.cache_dir.exists():
+            tracked = {name for entry in manifest.values() for name in entry[ENTRY_FILES]}
+            for file in self.cache_dir.iterdir():
+                if (
+                    file.is_file()
+                    and file.name not in tracked
+                    and file.name not in [MANIFEST_FILE, MANIFEST_TMP_FILE, ARTIFACTS_FILE]
+                ):
+                    stat = file.stat()
+                    manifest[file.name] = {
+                        ENTRY_FILES: [file.name],
+                        ENTRY_SIZE: stat.st_size,
+                        ENTRY_CREATED: stat.st_mtime,
+                        ENTRY_ACCESSED: stat.st_mtime,
+                    }
+
+        return manifest
+
+    def _save(self, manifest: Dict[str, Dict]) -> None:
+        if not self.cache_dir.exists():
+            self.cache_dir.mkdir(parents=True)
+
+        # Replace the manifest at once to not leave a partially written file
+        tmp_file = self.cache_dir / MANIFEST_TMP_FILE
+        tmp_file.write_text(json.dumps(manifest, indent=4), encoding="utf-8")
+        tmp_file.replace(self.manifest_file)
+
+    def _name(self, file: str | Path) -> str:
+        return Path(file).name
+
+    def _size(self, names: List[str]) -> int:
+        return sum(
+            (self.cache_dir / name).stat().st_size
+            for name in names
+            if (self.cache_dir / name).exists()
+        )
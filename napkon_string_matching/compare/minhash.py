@@ -0,0 +1,90 @@
+import zlib
+from typing import Dict, List
+
+import numpy as np
+from rapidfuzz import utils
+
+from napkon_string_matching.compare.pair_filters import PairFilter
+from napkon_string_matching.compare.score_functions import join_sorted
+
+# Mersenne prime used for the universal hash functions, small enough that products of two
+# values below it fit into 64 bit
+PRIME = (1 << 31) - 1
+
+DEFAULT_BANDS = 20
+DEFAULT_ROWS = 5
+DEFAULT_SHINGLE_SIZE = 3
+
+
+class MinHashIndex(PairFilter):
+    """
+    Approximate candidate generation using MinHash signatures of the character shingles of the
+    entries and a banded locality sensitive hashing index. A left and right entry are candidates
+    if their signatures are the same for all `rows` of at least one of the `bands`. Entries
+    without any shingle are never candidates.
+    """
+
+    name = "blocking"
+
+    def __init__(
+        self,
+        left: List[str | List[str]],
+        right: List[str | List[str]],
+        bands: int = DEFAULT_BANDS,
+        rows: int = DEFAULT_ROWS,
+        shingle_size: int = DEFAULT_SHINGLE_SIZE,
+        seed: int = 0,
+    ) -> None:
+        self.bands = bands
+        self.rows = rows
+        self.shingle_size = shingle_size
+
+        # Deterministic hash functions `(a * x + b) % PRIME`
+        generator = np.random.default_rng(seed)
+        self.a = generator.integers(1, PRIME, size=bands * rows, dtype=np.uint64)
+        self.b = generator.integers(0, PRIME, size=bands * rows, dtype=np.uint64)
+
+        self.left = [self.band_keys(entry) for entry in left]
+
+        self.buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        for row, entry in enumerate(right):
+            for bucket, key in zip(self.buckets, self.band_keys(entry)):
+                bucket.setdefault(key, []).append(row)
+
+    def signature(self, entry: str | List[str]) -> np.ndarray | None:
+        """
+        MinHash signature of the shingles of `entry` or `None` if there are no shingles
+        """
+        shingles = get_shingles(entry, self.shingle_size)
+        if not shingles:
+            return None
+
+        hashes = np.array(
+            [zlib.crc32(shingle.encode("utf-8")) % PRIME for shingle in shingles], dtype=np.uint64
+        )
+        return ((self.a[:, None] * hashes[None, :] + self.b[:, None]) % PRIME).min(axis=1)
+
+    def band_keys(self, entry: str | List[str]) -> List[bytes]:
+        signature = self.signature(entry)
+        if signature is None:
+            return []
+        return [band.tobytes() for band in signature.reshape(self.bands, self.rows)]
+
+    def mask(self, rows: np.ndarray, num_right: int) -> np.ndarray:
+        result = np.zeros((len(rows), num_right), dtype=bool)
+        for index, row in enumerate(rows):
+            for bucket, key in zip(self.buckets, self.left[row]):
+                if (columns := bucket.get(key)) is not None:
+                    result[index, columns] = True
+        return result
+
+
+def get_shingles(entry: str | List[str], shingle_size: int = DEFAULT_SHINGLE_SIZE) -> set:
+    """
+    Character shingles of the term or tokens in `entry` processed the same way as
+    for `fuzzy_match`
+    """
+    term = utils.default_process(join_sorted(entry) if isinstance(entry, list) else entry)
+    if 0 < len(term) < shingle_size:
+        return {term}
+    return {term[index : index + shingle_size] for index in range(len(term) - shingle_size + 1)}
@@ -0,0 +1,94 @@
+from typing import Any, Dict, List
+
+import numpy as np
+
+
+class PairFilter:
+    """
+    Restricts the combinations of left and right entries that are scored at all
+    """
+
+    name: str = "filtered"
+
+    def mask(self, rows: np.ndarray, num_right: int) -> np.ndarray:
+        """
+        Get the combinations of the left entries `rows` with all right entries to be scored
+
+        Attributes
+        ---
+            rows (ndarray):     indices of the left entries
+            num_right (int):    number of right entries
+
+        Returns
+        ---
+            ndarray: boolean matrix of shape `(len(rows), num_right)`, `False` for combinations
+            not to be scored
+        """
+        raise NotImplementedError()
+
+
+class ExcludedPairs(PairFilter):
+    """
+    Excludes the given combinations of left and right entries
+    """
+
+    name = "excluded"
+
+    def __init__(self, left: np.ndarray, right: np.ndarray) -> None:
+        self.excluded: Dict[int, np.ndarray] = {}
+        if len(left):
+            order = np.argsort(left, kind="stable")
+            left, right = np.asarray(left)[order], np.asarray(right)[order]
+            rows, starts = np.unique(left, return_index=True)
+            for row, columns in zip(rows, np.split(right, starts[1:])):
+                self.excluded[int(row)] = columns
+
+    def mask(self, rows: np.ndarray, num_right: int) -> np.ndarray:
+        result = np.ones((len(rows), num_right), dtype=bool)
+        for index, row in enumerate(rows):
+            if (columns := self.excluded.get(int(row))) is not None:
+                result[index, columns] = False
+        return result
+
+    def __len__(self) -> int:
+        return sum(len(columns) for columns in self.excluded.values())
+
+
+class CategoryPairs(PairFilter):
+    """
+    Only allows combinations of left and right entries sharing a category or both having
+    no category. Categories may be a single category or a list of categories per entry.
+    """
+
+    name = "categories"
+
+    def __init__(self, left: List[Any], right: List[Any]) -> None:
+        self.left = [_category_set(categories) for categories in left]
+
+        # Partition the right entries by their categories
+        partitions: Dict[Any, List[int]] = {}
+        uncategorized = []
+        for index, categories in enumerate(right):
+            categories = _category_set(categories)
+            if not categories:
+                uncategorized.append(index)
+            for category in categories:
+                partitions.setdefault(category, []).append(index)
+
+        self.partitions = {category: np.array(rows) for category, rows in partitions.items()}
+        self.uncategorized = np.array(uncategorized, dtype=int)
+
+    def mask(self, rows: np.ndarray, num_right: int) -> np.ndarray:
+        result = np.zeros((len(rows), num_right), dtype=bool)
+        for index, row in enumerate(rows):
+            categories = self.left[row]
+            if not categories:
+                result[index, self.uncategorized] = True
+            for category in categories:
+                if (columns := self.partitions.get(category)) is not None:
+                    result[index, columns] = True
+        return result
+
+
+def _category_set(categories) -> set:
+    return set(categories) if isinstance(categories, list) else {categories}
@@ -1,6 +1,11 @@
 from typing import List
 
-from rapidfuzz import fuzz
+import numpy as np
+from rapidfuzz import fuzz, process, utils
+
+# Increase if the scores calculated by any of the functions change, cached scores are then
+# calculated again
+VERSION = 1
 
 
 def intersection_vs_union(left: List[str] | str, right: List[str] | str) -> float:
@@ -13,6 +18,53 @@ def intersection_vs_union(left: List[str] | str, right: List[str] | str) -> floa
     return len(set_left.intersection(set_right)) / len(set_left.union(set_right))
 
 
+def intersection_vs_union_matrix(
+    left: List[List[str] | str], right: List[List[str] | str], score_cutoff: float | None = None
+) -> np.ndarray:
+    """
+    `intersection_vs_union` for all combinations of `left` and `right` entries. Combinations
+    without any tokens or a score below `score_cutoff` get a score of 0.
+    """
+    sets_left = [_token_set(entry) for entry in left]
+    sets_right = [_token_set(entry) for entry in right]
+
+    vocabulary = {token: index for index, token in enumerate(set().union(*sets_left, *sets_right))}
+    incidence_left = _incidence_matrix(sets_left, vocabulary)
+    incidence_right = _incidence_matrix(sets_right, vocabulary)
+
+    intersection = incidence_left @ incidence_right.T
+    union = incidence_left.sum(axis=1)[:, None] + incidence_right.sum(axis=1)[None, :]
+    union -= intersection
+
+    result = np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+    if score_cutoff:
+        result[result < score_cutoff] = 0
+    return result
+
+
+def intersection_vs_union_length_bound(
+    left: List[List[str] | str], right: List[List[str] | str]
+) -> np.ndarray:
+    """
+    Upper bound of `intersection_vs_union` for all combinations of `left` and `right` entries
+    derived from the number of tokens only.
+    """
+    sizes_left = np.array([len(_token_set(entry)) for entry in left])
+    sizes_right = np.array([len(_token_set(entry)) for entry in right])
+    return _length_ratio(sizes_left, sizes_right, np.minimum, np.maximum)
+
+
+def _token_set(entry: List[str] | str) -> set:
+    return set(entry if isinstance(entry, list) else entry.split())
+
+
+def _incidence_matrix(token_sets: List[set], vocabulary: dict) -> np.ndarray:
+    result = np.zeros((len(token_sets), len(vocabulary)))
+    for row, tokens in enumerate(token_sets):
+        result[row, [vocabulary[token] for token in tokens]] = 1
+    return result
+
+
 def join_sorted(value: List[str]) -> str:
     return " ".join(sorted(value, key=str.lower))
 
@@ -25,3 +77,49 @@ def fuzzy_match(left: str | List[str], right: str | List[str]) -> float:
     right_term = join_sorted(right) if isinstance(right, list) else right
 
     return fuzz.QRatio(left_term, right_term) / 100
+
+
+def fuzzy_match_matrix(
+    left: List[str | List[str]], right: List[str | List[str]], score_cutoff: float | None = None
+) -> np.ndarray:
+    """
+    `fuzzy_match` for all combinations of `left` and `right` terms. Combinations with a score
+    below `score_cutoff` get a score of 0.
+    """
+    left_terms = [join_sorted(term) if isinstance(term, list) else term for term in left]
+    right_terms = [join_sorted(term) if isinstance(term, list) else term for term in right]
+
+    scores = process.cdist(
+        left_terms,
+        right_terms,
+        scorer=fuzz.QRatio,
+        processor=utils.default_process,
+        score_cutoff=score_cutoff * 100 if score_cutoff else None,
+        dtype=np.float64,
+    )
+    return scores / 100
+
+
+def fuzzy_match_length_bound(
+    left: List[str | List[str]], right: List[str | List[str]]
+) -> np.ndarray:
+    """
+    Upper bound of `fuzzy_match` for all combinations of `left` and `right` terms derived from
+    the term lengths only. The Levenshtein distance used by QRatio is at least the difference
+    of both lengths, so the ratio cannot exceed `2 * min(lengths) / sum(lengths)`.
+    """
+    lengths_left = np.array([len(_process_term(term)) for term in left])
+    lengths_right = np.array([len(_process_term(term)) for term in right])
+    return _length_ratio(lengths_left, lengths_right, lambda x, y: 2 * np.minimum(x, y), np.add)
+
+
+def _process_term(term: str | List[str]) -> str:
+    return utils.default_process(join_sorted(term) if isinstance(term, list) else term)
+
+
+def _length_ratio(lengths_left: np.ndarray, lengths_right: np.ndarray, numerator, denominator):
+    numerators = numerator(lengths_left[:, None], lengths_right[None, :]).astype(float)
+    denominators = denominator(lengths_left[:, None], lengths_right[None, :])
+    return np.divide(
+        numerators, denominators, out=np.zeros_like(numerators), where=denominators > 0
+    )
@@ -0,0 +1,308 @@
+from collections import Counter
+from multiprocessing import Pool
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+import napkon_string_matching.compare.score_functions
+from napkon_string_matching.compare.pair_filters import PairFilter
+
+MATRIX_FUNCTION_SUFFIX = "_matrix"
+BOUND_FUNCTION_SUFFIX = "_length_bound"
+DEFAULT_BLOCK_SIZE = 1000
+DEFAULT_RECALL_SAMPLE_SIZE = 100
+STATISTICS_PRUNED = "pruned"
+STATISTICS_LENGTH_PRUNED = "length_pruned"
+
+# Allowed floating point error when deciding whether a pair can still reach a threshold
+PRUNE_TOLERANCE = 1e-9
+
+# Data shared with all blocks scored by a worker process, set by `_init_worker`
+_worker_args = {}
+
+
+def get_matrix_function(score_func: str):
+    """
+    Get the bulk variant of the score function `score_func` that scores all combinations
+    of two lists at once.
+    """
+    return getattr(
+        napkon_string_matching.compare.score_functions, score_func + MATRIX_FUNCTION_SUFFIX
+    )
+
+
+def get_bound_function(score_func: str):
+    """
+    Get the function calculating an upper bound of `score_func` for all combinations of two
+    lists from the lengths of the entries only. Returns `None` if there is no such function.
+    """
+    return getattr(
+        napkon_string_matching.compare.score_functions, score_func + BOUND_FUNCTION_SUFFIX, None
+    )
+
+
+def score_matrix(
+    left: List[List[List[str]]],
+    right: List[List[List[str]]],
+    score_func: str,
+    score_threshold: float | None = None,
+    statistics: Counter | None = None,
+    mask: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Calculate the scores for all combinations of the comparison values in `left` and `right`.
+    The scores are the same as calculated by `ComparableData.compare_terms` for each single pair
+    but each level is scored for all combinations in one go.
+
+    If `score_threshold` is given, combinations that cannot reach it anymore with the weight of
+    their remaining levels are not evaluated any further. Their score is below `score_threshold`
+    but not exact. If `score_func` provides an upper bound from the lengths of the entries, the
+    bound is used for levels not yet scored and combinations that cannot reach the threshold
+    because of their lengths are not scored at all. The number of these combinations is counted
+    in `statistics`. Combinations that are `False` in `mask` are not scored either.
+
+    Attributes
+    ---
+        left (List[List[List[str]]]):   comparison values as generated by `gen_comp_value`
+        right (List[List[List[str]]]):  comparison values as generated by `gen_comp_value`
+        score_func (str):               name of the function in `score_functions`
+        score_threshold (float):        minimum score of interest
+        statistics (Counter):           counter to add the number of pruned combinations to
+        mask (ndarray):                 combinations to be scored
+
+    Returns
+    ---
+        ndarray: matrix of shape `(len(left), len(right))` holding the scores
+    """
+    matrix_func = get_matrix_function(score_func)
+    bound_func = get_bound_function(score_func) if score_threshold else None
+
+    len_left = np.array([len(value) for value in left])
+    len_right = np.array([len(value) for value in right])
+    result = np.zeros((len(left), len(right)))
+    if result.size == 0:
+        return result
+
+    # Each pair uses the levels up to the number of levels of its longer value,
+    # the shorter value repeats its least specific level
+    pair_levels = np.maximum(len_left[:, None], len_right[None, :])
+    num_levels = pair_levels.max()
+    threshold = (score_threshold or 0) - PRUNE_TOLERANCE
+
+    def level_bound(level: int, rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        """
+        Upper bound of the weighted score of `level` for the selected combinations
+        """
+        selection = np.ix_(rows, columns)
+        bound = (
+            score_unique(
+                bound_func,
+                get_level([left[row] for row in rows], level),
+                get_level([right[column] for column in columns], level),
+            )
+            if bound_func is not None
+            else 1
+        )
+        return np.where(pair_levels[selection] >= level, bound * 0.5**level, 0)
+
+    # Upper bound of the score the levels not scored so far may add
+    all_rows, all_columns = np.arange(len(left)), np.arange(len(right))
+    remaining = np.zeros_like(result)
+    for level in range(1, num_levels + 1):
+        remaining += level_bound(level, all_rows, all_columns)
+
+    pending = np.ones_like(result, dtype=bool) if mask is None else mask.copy()
+    reachable = remaining >= threshold
+    if statistics is not None:
+        statistics[STATISTICS_LENGTH_PRUNED] += np.count_nonzero(pending & ~reachable)
+    pending &= reachable
+
+    factor = 1
+    for level in range(1, num_levels + 1):
+        factor /= 2
+
+        rows = np.flatnonzero(pending.any(axis=1))
+        columns = np.flatnonzero(pending.any(axis=0))
+        if rows.size == 0:
+            break
+        selection = np.ix_(rows, columns)
+        remaining[selection] -= level_bound(level, rows, columns)
+
+        # Scores below the lowest score any pending pair needs on this level to still reach
+        # the threshold do not have to be calculated exactly
+        needed = (threshold - result[selection] - remaining[selection]) / factor
+        score_cutoff = max(needed[pending[selection]].min(), 0)
+
+        scores = score_unique(
+            matrix_func,
+            get_level([left[row] for row in rows], level),
+            get_level([right[column] for column in columns], level),
+            score_cutoff=score_cutoff,
+        )
+        active = pending[selection] & (pair_levels[selection] >= level)
+        result[selection] += np.where(active, scores * factor, 0)
+
+        # Stop evaluating pairs that are complete or cannot reach the threshold anymore
+        unfinished = pair_levels > level
+        reachable = result + np.where(unfinished, remaining, 0) >= threshold
+        if statistics is not None:
+            statistics[STATISTICS_PRUNED] += np.count_nonzero(pending & unfinished & ~reachable)
+        pending &= unfinished & reachable
+
+    return result
+
+
+def score_unique(matrix_func, left: List[List[str]], right: List[List[str]], **kwargs):
+    """
+    Apply `matrix_func` to the unique entries of `left` and `right` only and spread the
+    resulting scores to all combinations of `left` and `right`.
+    """
+    unique_left, codes_left = factorize(left)
+    unique_right, codes_right = factorize(right)
+
+    scores = matrix_func(unique_left, unique_right, **kwargs)
+    return scores[codes_left[:, None], codes_right[None, :]]
+
+
+def factorize(entries: List) -> Tuple[List, np.ndarray]:
+    """
+    Get the unique entries in order of their first occurrence and for each entry the index
+    of its unique entry.
+    """
+    codes = {}
+    uniques = []
+    result = np.empty(len(entries), dtype=np.intp)
+    for index, entry in enumerate(entries):
+        key = _hashable(entry)
+        if (code := codes.get(key)) is None:
+            code = codes[key] = len(uniques)
+            uniques.append(entry)
+        result[index] = code
+    return uniques, result
+
+
+def _hashable(entry):
+    return tuple(_hashable(item) for item in entry) if isinstance(entry, (list, tuple)) else entry
+
+
+def get_level(values: List[List[List[str]]], level: int) -> List[List[str]]:
+    """
+    Get the entry of each comparison value for `level`. Values with fewer levels
+    fall back to their last level.
+    """
+    return [value[min(level, len(value) - 1)] for value in values]
+
+
+def iter_score_blocks(
+    left: List[List[List[str]]],
+    right: List[List[List[str]]],
+    score_func: str,
+    score_threshold: float = 0.0,
+    block_size: int | None = None,
+    workers: int | None = None,
+    statistics: Counter | None = None,
+    pair_filters: List[PairFilter] | None = None,
+) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Score all combinations of `left` and `right` by walking `left` in blocks of `block_size`
+    entries. Only a single block is scored at a time and only combinations with a score of at
+    least `score_threshold` are kept. With more than one of `workers` the blocks are scored by a
+    pool of processes, the results are still returned in the order of the blocks. Combinations
+    not evaluated completely are counted in `statistics`. Combinations rejected by any of
+    `pair_filters` are not scored and counted by the name of the filter.
+
+    Returns
+    ---
+        Iterator[Tuple[ndarray, ndarray, ndarray]]: per block the row indices into `left`, the
+        row indices into `right` and the scores of the kept combinations
+    """
+    if not block_size:
+        block_size = DEFAULT_BLOCK_SIZE
+
+    args = {
+        "left": left,
+        "right": right,
+        "score_func": score_func,
+        "score_threshold": score_threshold,
+        "block_size": block_size,
+        "pair_filters": pair_filters,
+    }
+    starts = range(0, len(left), block_size)
+
+    if workers and workers > 1:
+        with Pool(workers, initializer=_init_worker, initargs=(args,)) as pool:
+            blocks = pool.imap(_score_block_in_worker, starts)
+            for *block, block_statistics in blocks:
+                if statistics is not None:
+                    statistics.update(block_statistics)
+                yield tuple(block)
+    else:
+        for start in starts:
+            *block, block_statistics = _score_block(start=start, **args)
+            if statistics is not None:
+                statistics.update(block_statistics)
+            yield tuple(block)
+
+
+def _init_worker(args: dict) -> None:
+    _worker_args.update(args)
+
+
+def _score_block_in_worker(start: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Counter]:
+    return _score_block(start=start, **_worker_args)
+
+
+def _score_block(
+    left: List[List[List[str]]],
+    right: List[List[List[str]]],
+    score_func: str,
+    score_threshold: float,
+    block_size: int,
+    start: int,
+    pair_filters: List[PairFilter] | None = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Counter]:
+    statistics = Counter()
+    block = left[start : start + block_size]
+
+    mask = np.ones((len(block), len(right)), dtype=bool)
+    for pair_filter in pair_filters or []:
+        filter_mask = pair_filter.mask(np.arange(start, start + len(block)), len(right))
+        statistics[pair_filter.name] += np.count_nonzero(mask & ~filter_mask)
+        mask &= filter_mask
+
+    scores = score_matrix(
+        block,
+        right,
+        score_func,
+        score_threshold=score_threshold,
+        statistics=statistics,
+        mask=mask,
+    )
+    rows, columns = np.nonzero((scores >= score_threshold) & mask)
+    return rows + start, columns, scores[rows, columns], statistics
+
+
+def estimate_recall(
+    pair_filter: PairFilter,
+    left: List[List[List[str]]],
+    right: List[List[List[str]]],
+    score_func: str,
+    score_threshold: float,
+    sample_size: int = DEFAULT_RECALL_SAMPLE_SIZE,
+    seed: int = 0,
+) -> float | None:
+    """
+    Estimate the share of combinations reaching `score_threshold` that are not rejected by
+    `pair_filter`. A random sample of `sample_size` left entries is scored against all right
+    entries. Returns `None` if no combination in the sample reaches the threshold.
+    """
+    generator = np.random.default_rng(seed)
+    rows = np.sort(generator.choice(len(left), size=min(sample_size, len(left)), replace=False))
+
+    scores = score_matrix([left[row] for row in rows], right, score_func, score_threshold)
+    matches = scores >= score_threshold
+    if not matches.any():
+        return None
+
+    candidates = pair_filter.mask(rows, len(right))
+    return np.count_nonzero(matches & candidates) / np.count_nonzero(matches)
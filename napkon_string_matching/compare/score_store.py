@@ -0,0 +1,269 @@
+import json
+import logging
+from hashlib import md5
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from napkon_string_matching.cache.backend import CacheBackend, get_side_file, get_side_files
+from napkon_string_matching.compare.pair_filters import PairFilter
+
+logger = logging.getLogger(__name__)
+
+HASH_COLUMN = "Hash"
+LEFT_COLUMN = "Left"
+RIGHT_COLUMN = "Right"
+SCORE_COLUMN = "Score"
+LEFT_VALUES_NAME = "left"
+RIGHT_VALUES_NAME = "right"
+
+
+class ScoreStore:
+    """
+    Scores of combinations of distinct comparison values kept across comparisons. Values are
+    identified by the hash of their content. All combinations of the `left` and `right` values
+    have been evaluated, the scores of combinations reaching the threshold are kept.
+
+    Only combinations involving values not stored yet, e.g. of new or changed entries, need to be
+    scored again. The stored combinations are only valid for the score function, threshold and
+    pair filters they were scored with.
+
+    Attributes
+    ---
+        left (List[str]):       hashes of the evaluated left values
+        right (List[str]):      hashes of the evaluated right values
+        left_rows (ndarray):    index into `left` per kept combination
+        right_rows (ndarray):   index into `right` per kept combination
+        scores (ndarray):       score per kept combination
+    """
+
+    def __init__(
+        self,
+        left: List[str] | None = None,
+        right: List[str] | None = None,
+        left_rows: np.ndarray | None = None,
+        right_rows: np.ndarray | None = None,
+        scores: np.ndarray | None = None,
+    ) -> None:
+        self.left = list(left) if left is not None else []
+        self.right = list(right) if right is not None else []
+        self.left_rows = np.asarray(left_rows if left_rows is not None else [], dtype=int)
+        self.right_rows = np.asarray(right_rows if right_rows is not None else [], dtype=int)
+        self.scores = np.asarray(scores if scores is not None else [], dtype=float)
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def get_pairs(self, left: List[Any], right: List[Any]) -> "StoredPairs":
+        """
+        Get the stored combinations of the comparison values `left` and `right`
+
+        Returns
+        ---
+            StoredPairs:    filter rejecting the stored combinations, holding their scores
+        """
+        left_hashes = [gen_value_hash(value) for value in left]
+        right_hashes = [gen_value_hash(value) for value in right]
+
+        left_current = _current_indices(self.left, left_hashes)
+        right_current = _current_indices(self.right, right_hashes)
+
+        left_rows = left_current[self.left_rows]
+        right_rows = right_current[self.right_rows]
+        keep = (left_rows >= 0) & (right_rows >= 0)
+
+        return StoredPairs(
+            left_hashes=left_hashes,
+            right_hashes=right_hashes,
+            left_known=np.isin(np.arange(len(left)), left_current),
+            right_known=np.isin(np.arange(len(right)), right_current),
+            left_rows=left_rows[keep],
+            right_rows=right_rows[keep],
+            scores=self.scores[keep],
+        )
+
+    def update(
+        self,
+        left: List[str],
+        right: List[str],
+        left_rows: np.ndarray,
+        right_rows: np.ndarray,
+        scores: np.ndarray,
+    ) -> None:
+        """
+        Replace the content by all evaluated combinations of the values with the hashes `left`
+        and `right`. Values no longer used are dropped.
+        """
+        self.left = list(left)
+        self.right = list(right)
+        self.left_rows = np.asarray(left_rows, dtype=int)
+        self.right_rows = np.asarray(right_rows, dtype=int)
+        self.scores = np.asarray(scores, dtype=float)
+
+    def merge(
+        self,
+        blocks: Iterable[Tuple[np.ndarray, np.ndarray, np.ndarray]],
+        stored_pairs: "StoredPairs",
+        block_size: int,
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Add the `stored_pairs` to the `blocks` of `block_size` left values scored without them.
+        Once all blocks are consumed, the store is updated with the combinations of the values
+        of the `stored_pairs`.
+        """
+        merged = []
+        for index, block in enumerate(blocks):
+            start = index * block_size
+            block = tuple(
+                np.concatenate(arrays)
+                for arrays in zip(block, stored_pairs.get_block(start, start + block_size))
+            )
+            merged.append(block)
+            yield block
+
+        logger.info(
+            "reused %s stored combinations with %s scores",
+            "{:,}".format(stored_pairs.left_known.sum() * stored_pairs.right_known.sum()),
+            "{:,}".format(len(stored_pairs.scores)),
+        )
+
+        left_rows, right_rows, scores = (
+            [np.concatenate(arrays) for arrays in zip(*merged)] if merged else [[], [], []]
+        )
+        self.update(
+            stored_pairs.left_hashes, stored_pairs.right_hashes, left_rows, right_rows, scores
+        )
+
+    def write(self, file_name: str | Path, backend: CacheBackend) -> None:
+        """
+        Write the store to cache files using the format of the `backend`. The combinations are
+        written to `file_name`, the hashes of the values to separate files.
+        """
+        logger.info("write %i stored scores to cache file %s...", len(self), str(file_name))
+        file = Path(file_name)
+
+        pairs = pd.DataFrame(
+            {
+                LEFT_COLUMN: self.left_rows.astype(np.int32),
+                RIGHT_COLUMN: self.right_rows.astype(np.int32),
+                SCORE_COLUMN: self.scores,
+            }
+        )
+        backend.write(pairs, file)
+        backend.write(
+            pd.DataFrame({HASH_COLUMN: self.left}, dtype=object),
+            get_side_file(file, LEFT_VALUES_NAME),
+            key=file,
+        )
+        backend.write(
+            pd.DataFrame({HASH_COLUMN: self.right}, dtype=object),
+            get_side_file(file, RIGHT_VALUES_NAME),
+            key=file,
+        )
+        logger.info("...done")
+
+    @classmethod
+    def load(cls, file_name: str | Path, backend: CacheBackend):
+        """
+        Read the store from `file_name` if written before, otherwise get an empty store
+        """
+        if all(file.exists() for file in get_store_files(Path(file_name))):
+            return cls.read(file_name, backend)
+        return cls()
+
+    @classmethod
+    def read(cls, file_name: str | Path, backend: CacheBackend):
+        """
+        Read a store from cache files written by `write`
+        """
+        logger.info("read stored scores from cache file %s...", str(file_name))
+        file = Path(file_name)
+
+        pairs, _ = backend.read(file)
+        left, _ = backend.read(get_side_file(file, LEFT_VALUES_NAME), key=file)
+        right, _ = backend.read(get_side_file(file, RIGHT_VALUES_NAME), key=file)
+
+        result = cls(
+            left=left.get(HASH_COLUMN, []),
+            right=right.get(HASH_COLUMN, []),
+            left_rows=pairs.get(LEFT_COLUMN),
+            right_rows=pairs.get(RIGHT_COLUMN),
+            scores=pairs.get(SCORE_COLUMN),
+        )
+        logger.info("...got %i stored scores", len(result))
+        return result
+
+
+class StoredPairs(PairFilter):
+    """
+    Rejects the combinations of values already evaluated in a `ScoreStore` and holds the scores
+    of those reaching the threshold
+
+    Attributes
+    ---
+        left_hashes (List[str]):    hashes of the left values
+        right_hashes (List[str]):   hashes of the right values
+        left_known (ndarray):       per left value if it is stored
+        right_known (ndarray):      per right value if it is stored
+        left_rows (ndarray):        left value per stored combination, sorted
+        right_rows (ndarray):       right value per stored combination
+        scores (ndarray):           score per stored combination
+    """
+
+    name = "stored"
+
+    def __init__(
+        self,
+        left_hashes: List[str],
+        right_hashes: List[str],
+        left_known: np.ndarray,
+        right_known: np.ndarray,
+        left_rows: np.ndarray,
+        right_rows: np.ndarray,
+        scores: np.ndarray,
+    ) -> None:
+        self.left_hashes = left_hashes
+        self.right_hashes = right_hashes
+        self.left_known = left_known
+        self.right_known = right_known
+
+        order = np.lexsort((right_rows, left_rows))
+        self.left_rows = left_rows[order]
+        self.right_rows = right_rows[order]
+        self.scores = scores[order]
+
+    def mask(self, rows: np.ndarray, num_right: int) -> np.ndarray:
+        return ~(self.left_known[rows, np.newaxis] & self.right_known[np.newaxis, :num_right])
+
+    def get_block(self, start: int, stop: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the stored combinations of the left values from `start` to `stop`
+        """
+        first, last = np.searchsorted(self.left_rows, [start, stop])
+        return (
+            self.left_rows[first:last],
+            self.right_rows[first:last],
+            self.scores[first:last],
+        )
+
+
+def gen_value_hash(value: Any) -> str:
+    """
+    Hash of a comparison value based on its JSON representation
+    """
+    return md5(json.dumps(value, default=str).encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+def get_store_files(file: Path) -> List[Path]:
+    """
+    Get all files written by `ScoreStore.write` to `file`
+    """
+    return get_side_files(file, LEFT_VALUES_NAME, RIGHT_VALUES_NAME)
+
+
+def _current_indices(stored: List[str], current: List[str]) -> np.ndarray:
+    # Index of each stored value within the current values, -1 if not used anymore
+    positions = {value: index for index, value in enumerate(current)}
+    return np.array([positions.get(value, -1) for value in stored], dtype=int)
@@ -0,0 +1,63 @@
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+COLUMN_THRESHOLD = "Threshold"
+COLUMN_RESULTS = "Results"
+COLUMN_VALIDATED = "Validated"
+COLUMN_EXCLUDED = "Excluded"
+COLUMN_PRECISION = "Precision"
+COLUMN_RECALL = "Recall"
+
+
+def sweep_thresholds(
+    scores: np.ndarray,
+    thresholds: List[float],
+    positive: np.ndarray | None = None,
+    negative: np.ndarray | None = None,
+    num_positive: int | None = None,
+) -> pd.DataFrame:
+    """
+    Count the results reaching each of the `thresholds`. Scores are single precision, so the
+    thresholds are compared in the same precision.
+
+    If `positive` and `negative` mark the results known to match or not to match, e.g. by a
+    whitelist and blacklist, the number of these and the precision among them are calculated
+    for each threshold. The recall is relative to `num_positive`, the number of all known
+    matches.
+
+    Attributes
+    ---
+        scores (ndarray):           score per result
+        thresholds (List[float]):   thresholds to evaluate
+        positive (ndarray|None):    per result if it is a known match
+        negative (ndarray|None):    per result if it is known to not match
+        num_positive (int|None):    number of all known matches
+
+    Returns
+    ---
+        pd.DataFrame:   counts and metrics per threshold
+    """
+    scores = np.asarray(scores, dtype=np.float32)
+    thresholds = np.asarray(thresholds, dtype=np.float32)
+
+    order = np.argsort(-scores, kind="stable")
+    counts = np.searchsorted(-scores[order], -thresholds, side="right")
+    result = pd.DataFrame({COLUMN_THRESHOLD: thresholds, COLUMN_RESULTS: counts})
+
+    if positive is None or negative is None:
+        return result
+
+    # Number of known matches and non-matches among the best results
+    validated = np.concatenate([[0], np.cumsum(np.asarray(positive, dtype=bool)[order])])[counts]
+    excluded = np.concatenate([[0], np.cumsum(np.asarray(negative, dtype=bool)[order])])[counts]
+    known = validated + excluded
+
+    result[COLUMN_VALIDATED] = validated
+    result[COLUMN_EXCLUDED] = excluded
+    result[COLUMN_PRECISION] = np.divide(
+        validated, known, out=np.full(len(counts), np.nan), where=known > 0
+    )
+    result[COLUMN_RECALL] = validated / num_positive if num_positive else np.nan
+    return result
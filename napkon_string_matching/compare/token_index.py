@@ -0,0 +1,44 @@
+from typing import Dict, List
+
+import numpy as np
+
+from napkon_string_matching.compare.pair_filters import PairFilter
+
+
+class TokenIndex(PairFilter):
+    """
+    Blocking by an inverted index from tokens to the right entries. Only combinations of left
+    and right entries sharing at least `min_shared_tokens` tokens are scored. Tokens are
+    compared case-insensitive.
+    """
+
+    name = "blocking"
+
+    def __init__(
+        self, left: List[List[str]], right: List[List[str]], min_shared_tokens: int = 1
+    ) -> None:
+        self.min_shared_tokens = min_shared_tokens
+        self.left = [_normalize(tokens) for tokens in left]
+
+        index: Dict[str, List[int]] = {}
+        for row, tokens in enumerate(right):
+            for token in _normalize(tokens):
+                index.setdefault(token, []).append(row)
+        self.index = {token: np.array(rows) for token, rows in index.items()}
+
+    def mask(self, rows: np.ndarray, num_right: int) -> np.ndarray:
+        result = np.zeros((len(rows), num_right), dtype=bool)
+        for index, row in enumerate(rows):
+            postings = [
+                columns
+                for token in self.left[row]
+                if (columns := self.index.get(token)) is not None
+            ]
+            if postings:
+                shared = np.bincount(np.concatenate(postings), minlength=num_right)
+                result[index] = shared >= self.min_shared_tokens
+        return result
+
+
+def _normalize(tokens: List[str]) -> set:
+    return {token.casefold() for token in tokens}
@@ -0,0 +1,77 @@
+import heapq
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+
+class TopK:
+    """
+    Keeps the `k` best scored pairs per left identifier using bounded heaps. Pairs are pushed
+    while scoring, so at most `k` pairs per identifier are kept in memory.
+
+    If `mutual` is set, the best pairs are also selected per right identifier and only pairs
+    that are among the best of both sides are kept.
+
+    Attributes
+    ---
+        k (int):        number of pairs kept per identifier
+        mutual (bool):  only keep pairs that are among the best of both sides
+    """
+
+    def __init__(self, k: int, mutual: bool = False) -> None:
+        if k < 1:
+            raise ValueError(f"top_k has to be at least 1, got {k}")
+
+        self.k = k
+        self.mutual = mutual
+        self.left: Dict[Any, List[Tuple]] = {}
+        self.right: Dict[Any, List[Tuple]] = {}
+        self._count = 0
+
+    def push(
+        self,
+        left_ids: Iterable,
+        right_ids: Iterable,
+        left_rows: Iterable[int],
+        right_rows: Iterable[int],
+        scores: Iterable[float],
+    ) -> None:
+        for left_id, right_id, left_row, right_row, score in zip(
+            left_ids, right_ids, left_rows, right_rows, scores
+        ):
+            # On equal scores pairs pushed earlier are preferred
+            item = (score, -self._count, left_row, right_row)
+            self._count += 1
+
+            self._push(self.left.setdefault(left_id, []), item)
+            if self.mutual:
+                self._push(self.right.setdefault(right_id, []), item)
+
+    def _push(self, heap: List[Tuple], item: Tuple) -> None:
+        if len(heap) < self.k:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    def _selected(self) -> List[Tuple]:
+        selected = {item for heap in self.left.values() for item in heap}
+        if self.mutual:
+            selected &= {item for heap in self.right.values() for item in heap}
+
+        # Keep the order in which the pairs were pushed
+        return sorted(selected, key=lambda item: -item[1])
+
+    def result(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the kept pairs in the order they were pushed
+
+        Returns
+        ---
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: left rows, right rows and scores
+        """
+        selected = self._selected()
+        return (
+            np.array([item[2] for item in selected], dtype=int),
+            np.array([item[3] for item in selected], dtype=int),
+            np.array([item[0] for item in selected], dtype=float),
+        )
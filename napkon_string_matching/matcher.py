@@ -4,6 +4,8 @@ from pathlib import Path
 from string import Template
 from typing import Any, Dict
 
+from napkon_string_matching.cache.artifacts import Artifact, ArtifactGraph
+from napkon_string_matching.cache.manager import CacheManager
 from napkon_string_matching.constants import COHORTS
 from napkon_string_matching.prepare.match_preparator import MatchPreparator
 from napkon_string_matching.types.comparable import ComparisonResults
@@ -43,6 +45,8 @@ CONFIG_INPUT = "input"
 CONFIG_INPUT_BASE_DIR = "base_dir"
 CONFIG_OUTPUT_DIR = "output_dir"
 CONFIG_CACHE_DIR = "cache_dir"
+CONFIG_CACHE_FORMAT = "cache_format"
+CONFIG_CACHE_MAX_BYTES = "cache_max_bytes"
 
 RESULTS_FILE_PATTERN = "result_{score_threshold}_{compare_column}_{score_func}.xlsx"
 
@@ -67,6 +71,10 @@ class Matcher:
         self.input_config: Dict | None = config.get(CONFIG_INPUT)
         self.input_dir = self._input_config(CONFIG_INPUT_BASE_DIR)
         self.cache_dir = config.get(CONFIG_CACHE_DIR)
+        self.cache_format = config.get(CONFIG_CACHE_FORMAT)
+        self.cache_manager = get_cache_manager(config)
+        self.artifacts = ArtifactGraph()
+        self._table_definitions_artifact: Artifact | None = None
 
         # initialization without dependencies
         self._init_gecco_definition()
@@ -92,6 +100,20 @@ class Matcher:
         if geccoplus_file is not None:
             geccoplus_file = self.__expand_path(geccoplus_file)
 
+        # The JSON file is derived from the Excel files and rebuilt if these changed
+        if gecco83_file is not None and geccoplus_file is not None:
+            self.artifacts.update(
+                Artifact(
+                    target=Path(file_name),
+                    build=lambda: GeccoCombinedDefinition.read_excel_files(
+                        gecco83_file, geccoplus_file
+                    ),
+                    load=GeccoDefinition.read_json,
+                    save=lambda definition, file: definition.write_json(file),
+                    inputs=[gecco83_file, geccoplus_file],
+                )
+            )
+
         self.gecco = GeccoCombinedDefinition.prepare(
             file_name=file_name,
             preparator=self.preparator,
@@ -100,6 +122,8 @@ class Matcher:
             geccoplus_file=geccoplus_file,
             use_cache=self.use_cache,
             cache_dir=self.cache_dir,
+            cache_format=self.cache_format,
+            cache_manager=self.cache_manager,
         )
 
         if self.gecco is None:
@@ -116,6 +140,8 @@ class Matcher:
             **simplfier_config,
             use_cache=self.use_cache,
             cache_dir=self.cache_dir,
+            cache_format=self.cache_format,
+            cache_manager=self.cache_manager,
         )
 
         if self.kds is None:
@@ -143,6 +169,9 @@ class Matcher:
                 else None,
                 use_cache=self.use_cache,
                 cache_dir=self.cache_dir,
+                cache_format=self.cache_format,
+                cache_manager=self.cache_manager,
+                dependencies=[self.__expand_path(self._input_config(CONFIG_DATASET_DEFINITION))],
             )
 
             if dataset is None:
@@ -153,58 +182,78 @@ class Matcher:
 
     def _init_dataset_table_definitions(self):
         file_name = self.__expand_path(self._input_config(CONFIG_TABLE_DEFINITIONS))
-        definitions_file = Path(file_name)
 
         if self.dataset_def is None:
             raise Exception("`dataset_def` not initialized")
 
-        if definitions_file.exists():
-            logger.info("read table definitions from JSON file")
-            self.table_definitions = DatasetTablesExcelDefinitions.read_json(definitions_file)
-        else:
-            logger.info("read table definitions from Excel file")
-            self.table_definitions = DatasetTablesExcelDefinitions()
-            for cohort in COHORTS:
-                if file := self._input_config(CONFIG_FIELD_FILES)[cohort]:
-                    self.table_definitions.add_from_file(
-                        cohort,
-                        self.__expand_path(file),
-                        dataset_definitions=self.dataset_def[cohort],
-                    )
-                else:
-                    logger.warning("could not get table definitions: %s does not exists", file)
-            self.table_definitions.write_json(definitions_file)
+        # Definitions are rebuilt from the Excel files if these or the dataset definitions changed
+        files = {
+            cohort: self.__expand_path(file)
+            for cohort in COHORTS
+            if (file := self._input_config(CONFIG_FIELD_FILES)[cohort])
+        }
+        for cohort in COHORTS:
+            if cohort not in files:
+                logger.warning("could not get table definitions: no file for %s", cohort)
+
+        self._table_definitions_artifact = Artifact(
+            target=Path(file_name),
+            build=lambda: self._gen_table_definitions(files),
+            load=DatasetTablesExcelDefinitions.read_json,
+            save=lambda definitions, file: definitions.write_json(file),
+            inputs=[
+                *files.values(),
+                self.__expand_path(self._input_config(CONFIG_DATASET_DEFINITION)),
+            ],
+        )
+        self.table_definitions = self.artifacts.get(self._table_definitions_artifact)
+
+    def _gen_table_definitions(self, files: Dict[str, str]) -> DatasetTablesExcelDefinitions:
+        logger.info("read table definitions from Excel file")
+        table_definitions = DatasetTablesExcelDefinitions()
+        for cohort, file in files.items():
+            table_definitions.add_from_file(
+                cohort, file, dataset_definitions=self.dataset_def[cohort]
+            )
+        return table_definitions
 
     def _init_table_categories(self) -> None:
         if self.table_definitions is None:
             raise Exception("`table_definitions` not initialized")
 
         file = self._input_config(CONFIG_TABLE_CATEGORIES)
-        if file is not None:
-            file = self.__expand_path(file)
-            if Path(file).exists():
+        if file is None:
+            return
+        file = Path(self.__expand_path(file))
+
+        excel_file = self._input_config(CONFIG_TABLE_CATEGORIES_EXCEL)
+        if not excel_file:
+            if file.exists():
                 logger.info("read categories from JSON file")
                 self.table_categories = TableCategories.read_json(file)
             else:
-                logger.info("read categories from Excel file")
-                file_name = self._input_config(CONFIG_TABLE_CATEGORIES_EXCEL)
-                if file_name:
-                    excel_file = self.__expand_path(file_name)
-                    if Path(excel_file).exists():
-                        self.table_categories = TableCategories.read_excel(
-                            excel_path=excel_file,
-                            tables_definitions=self.table_definitions,
-                        )
-                        self.table_categories.write_json(file)
-                    else:
-                        logger.warning(
-                            "could not get categories Excel file: %s does not exist", excel_file
-                        )
-                else:
-                    logger.warning(
-                        "could not get categories Excel file: %s not configured",
-                        CONFIG_TABLE_CATEGORIES_EXCEL,
-                    )
+                logger.warning(
+                    "could not get categories Excel file: %s not configured",
+                    CONFIG_TABLE_CATEGORIES_EXCEL,
+                )
+            return
+
+        excel_file = self.__expand_path(excel_file)
+        if not file.exists() and not Path(excel_file).exists():
+            logger.warning("could not get categories Excel file: %s does not exist", excel_file)
+            return
+
+        # Categories are rebuilt if the Excel file or the table definitions changed
+        categories = Artifact(
+            target=file,
+            build=lambda table_definitions: TableCategories.read_excel(
+                excel_path=excel_file, tables_definitions=table_definitions
+            ),
+            load=TableCategories.read_json,
+            save=lambda table_categories, file: table_categories.write_json(file),
+            inputs=[excel_file, self._table_definitions_artifact],
+        )
+        self.table_categories = self.artifacts.get(categories)
 
     def _init_mappings(self) -> None:
         self.mappings_whitelist = Mapping()
@@ -212,10 +261,13 @@ class Matcher:
         dir = self.__expand_path(self._input_config(CONFIG_FIELD_MAPPINGS))
         mapping_folder = Path(dir)
 
+        # Whitelisted mappings sharing an identifier are combined, so entries matched through a
+        # chain of mappings, e.g. across different cohorts, are also excluded from comparisons
         logger.info("read whitelists...")
         for file in mapping_folder.glob("whitelist/*.json"):
             mapping = Mapping.read_json(file)
-            self.mappings_whitelist.update(mapping)
+            self.mappings_whitelist.update_values(mapping)
+        logger.info("combined whitelists to %s", self.mappings_whitelist.num_entries_repr())
 
         logger.info("read blacklists...")
         for file in mapping_folder.glob("blacklist/*.json"):
@@ -236,6 +288,8 @@ class Matcher:
                 left_name="gecco",
                 right_name=name,
                 cache_dir=self.cache_dir,
+                cache_format=self.cache_format,
+                cache_manager=self.cache_manager,
                 **self.config[CONFIG_FIELD_MATCHING],
             )
             self.results[f"gecco vs {name}"] = matches
@@ -272,6 +326,8 @@ class Matcher:
                     left_name=name_first,
                     right_name=name_second,
                     cache_dir=self.cache_dir,
+                    cache_format=self.cache_format,
+                    cache_manager=self.cache_manager,
                     **{**self.config[CONFIG_FIELD_MATCHING], **kwargs},
                 )
                 self.results[f"{prefix if prefix else ''}{name_first} vs {name_second}"] = matches
@@ -319,9 +375,14 @@ class Matcher:
                 entries.append("{}: {}".format(key, value))
             logger.info("%s\t%s", name, "\t".join(entries))
 
-    def write_results(self) -> None:
+    def write_results(self, **kwargs) -> None:
+        """
+        Write the results to a XLSX file named by the matching configuration, values of the
+        configuration may be overridden by `kwargs`
+        """
         format_args = {
             **self.config[CONFIG_FIELD_MATCHING],
+            **kwargs,
             "score_func": self.config[CONFIG_FIELD_MATCHING]["score_func"].replace("_", "-"),
         }
         output_file = RESULTS_FILE_PATTERN.format(**format_args)
@@ -335,3 +396,9 @@ class Matcher:
 
     def __expand_path(self, path: str) -> str:
         return Template(path).substitute(input_base_dir=self.input_dir)
+
+
+def get_cache_manager(config: Dict) -> CacheManager:
+    return CacheManager(
+        config.get(CONFIG_CACHE_DIR) or "cache", max_bytes=config.get(CONFIG_CACHE_MAX_BYTES)
+    )
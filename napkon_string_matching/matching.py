@@ -2,7 +2,7 @@
 # distance between the item names from SUEP, HAP and POP.
 
 import logging
-from typing import Dict
+from typing import Dict, List
 
 from napkon_string_matching.matcher import Matcher
 from napkon_string_matching.prepare.match_preparator import MatchPreparator
@@ -18,7 +18,15 @@ logger = logging.getLogger(__name__)
 def match(config: Dict, use_cache=True) -> None:
     matcher = create_matcher(config, use_cache)
 
-    for step in config[CONFIG_FIELD_STEPS]:
+    run_steps(matcher, config[CONFIG_FIELD_STEPS])
+
+    matcher.print_analysis()
+
+    matcher.write_results()
+
+
+def run_steps(matcher: Matcher, steps: List[str]) -> None:
+    for step in steps:
         match step:
             case "variables":
                 matcher.match_questionnaires_variables()
@@ -27,10 +35,6 @@ def match(config: Dict, use_cache=True) -> None:
             case "questionnaires":
                 matcher.match_questionnaires()
 
-    matcher.print_analysis()
-
-    matcher.write_results()
-
 
 def create_matcher(config: Dict, use_cache=True):
     preparator = MatchPreparator(config[CONFIG_FIELD_PREPARE])
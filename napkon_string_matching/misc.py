@@ -1,18 +1,33 @@
 import logging
+from copy import deepcopy
+from datetime import datetime
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Set
 
 import pandas as pd
 
-from napkon_string_matching.matcher import Matcher
-from napkon_string_matching.matching import create_matcher
-from napkon_string_matching.types.comparable_data import Columns, ComparableColumns
+from napkon_string_matching.compare.threshold_sweep import COLUMN_RESULTS, sweep_thresholds
+from napkon_string_matching.matcher import (
+    CONFIG_FIELD_MATCHING,
+    Matcher,
+    get_cache_manager,
+)
+from napkon_string_matching.matching import CONFIG_FIELD_STEPS, create_matcher, run_steps
+from napkon_string_matching.types.comparable import ComparisonResults, CompactComparable
+from napkon_string_matching.types.comparable_data import (
+    Columns,
+    ComparableColumns,
+    ComparableData,
+    flatten_mapping,
+    remove_existing_pairs,
+)
 from napkon_string_matching.types.dataset_table.dataset_table import DatasetTable
 from napkon_string_matching.types.mapping import Mapping
 from napkon_string_matching.types.mapping_types.matched_mapping import MatchedMapping
 
 LABEL_ID = "Id"
 LABEL_COHORT = "Kohorte"
+LABEL_COMPARISON = "Comparison"
 
 logger = logging.getLogger(__name__)
 
@@ -39,7 +54,7 @@ def generate_combined_mapping(mapping_dir: str | Path, output_dir: str | Path):
     mappings = Mapping()
     for file in mapping_dir.glob("*.json"):
         mapping = Mapping.read_json(file)
-        mappings.update(mapping)
+        mappings.update_values(mapping)
 
     mappings.write_json(output_file)
 
@@ -213,3 +228,166 @@ def print_statistics(config: Dict):
     print(f"reduced no. of comparisons about {comps_reduced:,}")
     print(f"no. of potential comparisons: {total_number_cohorts-comps_reduced:,}")
     print(devider)
+
+
+def print_cache_statistics(config: Dict) -> None:
+    manager = get_cache_manager(config)
+    stats = manager.stats()
+
+    def format_time(timestamp: float | None) -> str:
+        return datetime.fromtimestamp(timestamp).isoformat(" ", "seconds") if timestamp else "-"
+
+    max_bytes = stats["max_bytes"]
+    print(f"cache directory: {manager.cache_dir}")
+    print(f"entries: {stats['entries']:,} ({stats['files']:,} files)")
+    print(f"size: {stats['size']:,} bytes")
+    print(f"budget: {f'{max_bytes:,} bytes' if max_bytes is not None else 'unlimited'}")
+    print(f"oldest access: {format_time(stats['oldest_access'])}")
+    print(f"newest access: {format_time(stats['newest_access'])}")
+
+
+def prune_cache(config: Dict) -> None:
+    manager = get_cache_manager(config)
+    if manager.max_bytes is None:
+        logger.warning("no cache budget configured, only updating the manifest")
+
+    removed = manager.prune()
+    logger.info("removed %i cache entries", len(removed))
+
+
+def sweep_score_thresholds(
+    config: Dict, thresholds: List[float], write_results: bool = False
+) -> pd.DataFrame:
+    """
+    Report the number of results per comparison for each of the `thresholds` from a single
+    scoring run. The thresholds are used for `score_threshold`, comparisons of variables keep the
+    configured `variable_score_threshold`. Results are also evaluated against the whitelist and
+    blacklist: entries of the whitelist are counted as matches, entries of the blacklist as
+    non-matches. With `write_results` the results are written for each threshold.
+
+    Returns
+    ---
+        pd.DataFrame:   counts and metrics per comparison and threshold
+    """
+    thresholds = sorted(set(thresholds))
+    config = deepcopy(config)
+    matching_config = config[CONFIG_FIELD_MATCHING]
+
+    # Score once using the lowest threshold, cached scores are reused if they cover it
+    cache_threshold = matching_config.get("cache_threshold") or matching_config["score_threshold"]
+    if thresholds[0] < cache_threshold:
+        logger.warning(
+            "thresholds below the cache threshold %s require scoring again", cache_threshold
+        )
+    matching_config["cache_threshold"] = min(cache_threshold, thresholds[0])
+    matching_config["score_threshold"] = thresholds[0]
+    if matching_config.get("top_k"):
+        logger.warning("best matches are selected before removing pairs of existing mappings")
+
+    # Score without the existing mappings to evaluate against them, the results of the matching
+    # are derived by removing their pairs afterwards
+    matcher = create_matcher(config)
+    whitelist, blacklist = matcher.mappings_whitelist, matcher.mappings_blacklist
+    matcher.mappings_whitelist, matcher.mappings_blacklist = Mapping(), Mapping()
+
+    compare_columns = {}
+    for step in config[CONFIG_FIELD_STEPS]:
+        run_steps(matcher, [step])
+        column = (
+            Columns.VARIABLE.value if step == "variables" else matching_config["compare_column"]
+        )
+        compare_columns.update(
+            {name: column for name, _ in matcher.results.items() if name not in compare_columns}
+        )
+    unfiltered = matcher.results
+
+    results = ComparisonResults()
+    tables = []
+    for name, result in unfiltered.items():
+        results[name] = _remove_existing_pairs(
+            result, compare_columns[name], whitelist, blacklist, matcher, matching_config
+        )
+
+        table = _evaluate_thresholds(
+            result, thresholds, whitelist, blacklist, matcher, matching_config
+        )
+        table[COLUMN_RESULTS] = sweep_thresholds(results[name].scores, thresholds)[COLUMN_RESULTS]
+        table.insert(0, LABEL_COMPARISON, name)
+        tables.append(table)
+
+    summary = pd.concat(tables, ignore_index=True) if tables else pd.DataFrame()
+    print(summary.to_string(index=False))
+
+    if write_results:
+        for threshold in thresholds:
+            matcher.results = ComparisonResults(
+                {name: result.filter_score(threshold) for name, result in results.items()}
+            )
+            matcher.write_results(score_threshold=threshold)
+
+    return summary
+
+
+def _remove_existing_pairs(
+    result: CompactComparable,
+    compare_column: str,
+    whitelist: Mapping,
+    blacklist: Mapping,
+    matcher: Matcher,
+    matching_config: Dict,
+) -> CompactComparable:
+    left_name, right_name = result.left_name.lower(), result.right_name.lower()
+    return remove_existing_pairs(
+        result,
+        _get_data(left_name, matcher).dropna(subset=[compare_column]),
+        _get_data(right_name, matcher).dropna(subset=[compare_column]),
+        left_name,
+        right_name,
+        whitelist,
+        blacklist,
+        identifier_column_left=matching_config.get("identifier_column_left"),
+        identifier_column_right=matching_config.get("identifier_column_right"),
+    )
+
+
+def _evaluate_thresholds(
+    result: CompactComparable,
+    thresholds: List[float],
+    whitelist: Mapping,
+    blacklist: Mapping,
+    matcher: Matcher,
+    matching_config: Dict,
+) -> pd.DataFrame:
+    left_name, right_name = result.left_name.lower(), result.right_name.lower()
+    left_column = matching_config.get("identifier_column_left") or Columns.IDENTIFIER.value
+    right_column = matching_config.get("identifier_column_right") or Columns.IDENTIFIER.value
+    pairs = pd.MultiIndex.from_arrays(
+        [result.get_column(left_column), result.get_column(right_column, left=False)]
+    )
+
+    matches = flatten_mapping(left_name, right_name, whitelist)
+    non_matches = flatten_mapping(left_name, right_name, blacklist)
+
+    # Only matches of entries being compared can be found
+    left_identifiers = _get_identifiers(left_name, matcher)
+    right_identifiers = _get_identifiers(right_name, matcher)
+    num_matches = sum(
+        1 for left, right in matches if left in left_identifiers and right in right_identifiers
+    )
+
+    return sweep_thresholds(
+        result.scores,
+        thresholds,
+        positive=pairs.isin(matches),
+        negative=pairs.isin(non_matches),
+        num_positive=num_matches,
+    )
+
+
+def _get_identifiers(name: str, matcher: Matcher) -> Set[str]:
+    comparable = _get_data(name, matcher)
+    return set(comparable[Columns.IDENTIFIER.value]) if comparable is not None else set()
+
+
+def _get_data(name: str, matcher: Matcher) -> ComparableData | None:
+    return matcher.gecco if name == "gecco" else matcher.questionnaires.get(name)
@@ -0,0 +1,109 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from napkon_string_matching.cache.artifacts import Artifact, ArtifactGraph
+
+
+def read(file: Path) -> str:
+    return file.read_text(encoding="utf-8")
+
+
+def write(value: str, file: Path) -> None:
+    file.write_text(value, encoding="utf-8")
+
+
+class TestArtifactGraph(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.dir = Path(self.directory.name)
+        self.source = self.dir / "source.txt"
+        write("a b", self.source)
+        self.builds = []
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def gen_artifacts(self, separator: str = " "):
+        def build_words():
+            self.builds.append("words")
+            return "\n".join(read(self.source).split(separator))
+
+        def build_count(words: str):
+            self.builds.append("count")
+            return str(len(words.splitlines()))
+
+        words = Artifact(
+            target=self.dir / "words.txt",
+            build=build_words,
+            load=read,
+            save=write,
+            inputs=[self.source],
+            config={"separator": separator},
+        )
+        count = Artifact(
+            target=self.dir / "count.txt",
+            build=build_count,
+            load=read,
+            save=write,
+            inputs=[words],
+        )
+        return words, count
+
+    def test_build_and_reuse(self):
+        _, count = self.gen_artifacts()
+        self.assertEqual("2", ArtifactGraph().get(count))
+        self.assertEqual(["words", "count"], self.builds)
+
+        self.builds.clear()
+        self.assertEqual("2", ArtifactGraph().get(count))
+        self.assertEqual([], self.builds)
+
+    def test_rebuild_on_changed_input(self):
+        _, count = self.gen_artifacts()
+        ArtifactGraph().get(count)
+
+        self.builds.clear()
+        write("a b c", self.source)
+        self.assertEqual("3", ArtifactGraph().get(count))
+        self.assertEqual(["words", "count"], self.builds)
+
+    def test_rebuild_on_changed_config(self):
+        ArtifactGraph().get(self.gen_artifacts()[1])
+
+        self.builds.clear()
+        self.assertEqual("1", ArtifactGraph().get(self.gen_artifacts(separator=",")[1]))
+        self.assertEqual(["words", "count"], self.builds)
+
+    def test_early_cutoff(self):
+        _, count = self.gen_artifacts()
+        ArtifactGraph().get(count)
+
+        # The words are rebuilt with the same content, so the count stays valid
+        self.builds.clear()
+        write("a  b", self.source)
+        self.assertEqual("2", ArtifactGraph().get(self.gen_artifacts(separator=None)[1]))
+        self.assertEqual(["words"], self.builds)
+
+    def test_missing_source(self):
+        _, count = self.gen_artifacts()
+        ArtifactGraph().get(count)
+
+        self.builds.clear()
+        self.source.unlink()
+        self.assertEqual("2", ArtifactGraph().get(count))
+        self.assertEqual([], self.builds)
+
+    def test_no_cache(self):
+        _, count = self.gen_artifacts()
+        self.assertEqual("2", ArtifactGraph(use_cache=False).get(count))
+        self.assertFalse((self.dir / "count.txt").exists())
+
+        ArtifactGraph().get(count)
+        self.builds.clear()
+        ArtifactGraph(use_cache=False).get(count)
+        self.assertEqual(["words", "count"], self.builds)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pandas as pd
+
+from napkon_string_matching.cache.backend import get_cache_backend
+
+
+class TestBackend(unittest.TestCase):
+    def test_read_write(self):
+        df = pd.DataFrame(
+            {
+                "Identifier": ["1", "2", None],
+                "Term": [["Anamnese", ["Diabetes", "Typ"]], ["Labor"], []],
+                "Tokens": [["Diabetes", "Typ"], ["Labor"], []],
+                "Score": [0.5, 1.0, 0.25],
+            }
+        )
+
+        for cache_format in ["json", "parquet", "arrow"]:
+            with self.subTest(cache_format=cache_format), TemporaryDirectory() as directory:
+                backend = get_cache_backend(cache_format)
+                file = backend.path(Path(directory) / "cache")
+
+                backend.write(df, file, metadata={"name": "test"})
+                result, metadata = backend.read(file)
+
+                self.assertEqual({"name": "test"}, metadata)
+                self.assertEqual(df.to_dict(orient="list"), result.to_dict(orient="list"))
+
+    def test_unknown(self):
+        self.assertRaises(ValueError, get_cache_backend, "csv")
@@ -0,0 +1,62 @@
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pandas as pd
+
+from napkon_string_matching.cache.backend import get_cache_backend
+from napkon_string_matching.cache.manager import CacheManager
+from napkon_string_matching.types.comparable import COLUMN_NAMES, CompactComparable
+
+
+class TestCacheManager(unittest.TestCase):
+    def test_lru(self):
+        with TemporaryDirectory() as directory:
+            cache_dir = Path(directory)
+            manager = CacheManager(cache_dir, max_bytes=25)
+
+            # Untracked files are added with their modification time
+            (cache_dir / "old.json").write_text("0" * 10)
+            os.utime(cache_dir / "old.json", (0, 0))
+
+            (cache_dir / "a.json").write_text("1" * 10)
+            manager.record("a.json", cache_dir / "a.json")
+            (cache_dir / "a_left.json").write_text("1" * 5)
+            manager.record("a.json", cache_dir / "a_left.json")
+
+            stats = manager.stats()
+            self.assertEqual(2, stats["entries"])
+            self.assertEqual(25, stats["size"])
+
+            # Writing another entry evicts the least recently used one
+            (cache_dir / "b.json").write_text("2" * 10)
+            manager.record("b.json", cache_dir / "b.json")
+            self.assertFalse((cache_dir / "old.json").exists())
+            self.assertTrue((cache_dir / "a_left.json").exists())
+
+            manager.touch("a.json")
+            self.assertEqual(["b.json"], manager.prune(max_bytes=20))
+            files = sorted(path.name for path in cache_dir.glob("*.json"))
+            self.assertEqual(["a.json", "a_left.json", "manifest.json"], files)
+            self.assertEqual(1, manager.stats()["entries"])
+
+    def test_backend(self):
+        with TemporaryDirectory() as directory:
+            manager = CacheManager(directory)
+            backend = get_cache_backend("parquet", manager=manager)
+            file = backend.path(Path(directory) / "compared")
+
+            CompactComparable(
+                left_name="Hap",
+                right_name="Pop",
+                left=pd.DataFrame({"Hap" + column: ["l0"] for column in COLUMN_NAMES}),
+                right=pd.DataFrame({"Pop" + column: ["r0"] for column in COLUMN_NAMES}),
+                left_rows=[0],
+                right_rows=[0],
+                scores=[0.5],
+            ).write_cache(file, backend)
+
+            stats = manager.stats()
+            self.assertEqual(1, stats["entries"])
+            self.assertEqual(3, stats["files"])
@@ -0,0 +1,41 @@
+import unittest
+
+import numpy as np
+
+from napkon_string_matching.compare.minhash import MinHashIndex, get_shingles
+from napkon_string_matching.compare.score_matrix import estimate_recall
+
+LEFT = [["Diabetes", "mellitus", "Typ"], ["Asthma", "bronchiale"], []]
+RIGHT = [["Typ", "Diabetes", "mellitus"], ["Körpergröße"], ["asthma", "bronchiale"], []]
+
+
+class TestMinHash(unittest.TestCase):
+    def test_get_shingles(self):
+        self.assertEqual({"abc", "bcd"}, get_shingles("ABCD"))
+        self.assertEqual({"ab"}, get_shingles(["ab"]))
+        self.assertEqual(set(), get_shingles([]))
+
+    def test_mask(self):
+        result = MinHashIndex(LEFT, RIGHT, bands=10, rows=2).mask(np.arange(3), 4)
+
+        # Entries with the same processed term are always candidates, empty ones never
+        self.assertTrue(result[0, 0])
+        self.assertTrue(result[1, 2])
+        self.assertFalse(result[2].any())
+        self.assertFalse(result[:, 3].any())
+
+    def test_deterministic(self):
+        first = MinHashIndex(LEFT, RIGHT, seed=1)
+        second = MinHashIndex(LEFT, RIGHT, seed=1)
+
+        self.assertEqual(first.left, second.left)
+        np.testing.assert_array_equal(first.mask(np.arange(3), 4), second.mask(np.arange(3), 4))
+
+    def test_estimate_recall(self):
+        left = [[entry, entry] for entry in LEFT[:2]]
+        right = [[entry, entry] for entry in RIGHT[:3]]
+        pair_filter = MinHashIndex(LEFT[:2], RIGHT[:3], bands=10, rows=2)
+
+        recall = estimate_recall(pair_filter, left, right, "fuzzy_match", 0.5)
+
+        self.assertEqual(1.0, recall)
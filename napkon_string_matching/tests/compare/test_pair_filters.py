@@ -0,0 +1,33 @@
+import unittest
+
+import numpy as np
+
+from napkon_string_matching.compare.pair_filters import CategoryPairs, ExcludedPairs
+
+
+class TestPairFilters(unittest.TestCase):
+    def test_excluded_pairs(self):
+        pair_filter = ExcludedPairs(np.array([2, 0, 2]), np.array([1, 0, 2]))
+
+        result = pair_filter.mask(np.array([1, 2]), 3)
+
+        np.testing.assert_array_equal([[True, True, True], [True, False, False]], result)
+        self.assertEqual(3, len(pair_filter))
+
+    def test_category_pairs_lists(self):
+        pair_filter = CategoryPairs([["A"], ["A", "B"], []], [["B"], [], ["A", "C"]])
+
+        result = pair_filter.mask(np.array([0, 1, 2]), 3)
+
+        np.testing.assert_array_equal(
+            [[False, False, True], [True, False, True], [False, True, False]], result
+        )
+
+    def test_category_pairs_single_category(self):
+        pair_filter = CategoryPairs(["A", "C"], [["B"], [], ["A", "C"], "C"])
+
+        result = pair_filter.mask(np.array([0, 1]), 4)
+
+        np.testing.assert_array_equal(
+            [[False, False, True, False], [False, False, True, True]], result
+        )
@@ -0,0 +1,46 @@
+import unittest
+
+import numpy as np
+
+from napkon_string_matching.compare import score_functions
+
+TERMS_LEFT = [["Diabetes", "mellitus", "Typ", "2"], ["Asthma"], "Körpergröße", []]
+TERMS_RIGHT = [["Diabetes", "Typ", "2"], ["Asthma", "bronchiale"], "Größe in cm", "Körpergröße"]
+
+
+class TestScoreFunctions(unittest.TestCase):
+    def test_matrix_functions(self):
+        for name in ["fuzzy_match", "intersection_vs_union"]:
+            score_func = getattr(score_functions, name)
+            matrix_func = getattr(score_functions, name + "_matrix")
+
+            result = matrix_func(TERMS_LEFT, TERMS_RIGHT)
+
+            for i, left in enumerate(TERMS_LEFT):
+                for j, right in enumerate(TERMS_RIGHT):
+                    try:
+                        expected = score_func(left, right)
+                    except ZeroDivisionError:
+                        expected = 0
+                    self.assertAlmostEqual(expected, result[i, j])
+
+    def test_matrix_functions_score_cutoff(self):
+        for name in ["fuzzy_match", "intersection_vs_union"]:
+            matrix_func = getattr(score_functions, name + "_matrix")
+            expected = matrix_func(TERMS_LEFT, TERMS_RIGHT)
+
+            result = matrix_func(TERMS_LEFT, TERMS_RIGHT, score_cutoff=0.5)
+
+            np.testing.assert_array_equal(np.where(expected >= 0.5, expected, 0), result)
+
+    def test_length_bound(self):
+        for name in ["fuzzy_match", "intersection_vs_union"]:
+            matrix_func = getattr(score_functions, name + "_matrix")
+            bound_func = getattr(score_functions, name + "_length_bound")
+
+            scores = matrix_func(TERMS_LEFT, TERMS_RIGHT)
+            bounds = bound_func(TERMS_LEFT, TERMS_RIGHT)
+
+            self.assertEqual(scores.shape, bounds.shape)
+            self.assertTrue(np.all(scores <= bounds))
+            self.assertTrue(np.any(bounds < 1))
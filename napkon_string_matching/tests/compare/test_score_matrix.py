@@ -0,0 +1,126 @@
+import unittest
+from collections import Counter
+
+import numpy as np
+
+from napkon_string_matching.compare import score_functions
+from napkon_string_matching.compare.score_matrix import (
+    STATISTICS_LENGTH_PRUNED,
+    STATISTICS_PRUNED,
+    factorize,
+    iter_score_blocks,
+    score_matrix,
+)
+from napkon_string_matching.types.comparable_data import ComparableData
+
+# Comparison values as generated by `ComparableData.gen_comp_value`
+COMP_VALUES_LEFT = [
+    [
+        ["2", "Diabetes", "mellitus", "Typ"],
+        ["2", "Diabetes", "mellitus", "Patient", "Typ"],
+        ["2", "Anamnese", "Diabetes", "mellitus", "Patient", "Typ", "Vorerkrankungen"],
+    ],
+    [["Asthma"], ["Asthma", "Lungenerkrankung", "Patient"]],
+    [["Körpergröße"]],
+]
+COMP_VALUES_RIGHT = [
+    [
+        ["2", "Diabetes", "Typ"],
+        ["2", "Bestand", "Diabetes", "Typ"],
+        ["2", "Bestand", "Diabetes", "Typ", "Vorerkrankungen"],
+    ],
+    [
+        ["Asthma", "bronchiale"],
+        ["Asthma", "bronchiale", "Chronische", "Lungenerkrankung"],
+        ["Anamnese", "Asthma", "bronchiale", "Chronische", "Lungenerkrankung", "Vorerkrankungen"],
+    ],
+    [["cm", "Körpergröße"], ["cm", "Größe", "Körpergröße", "Patienten"]],
+    [["Körpergröße"]],
+]
+
+
+class TestScoreMatrix(unittest.TestCase):
+    def setUp(self) -> None:
+        self.left = COMP_VALUES_LEFT
+        self.right = COMP_VALUES_RIGHT
+
+    def test_same_as_compare_terms(self):
+        for name in ["fuzzy_match", "intersection_vs_union"]:
+            score_func = getattr(score_functions, name)
+            expected = np.array(
+                [
+                    [ComparableData.compare_terms(left, right, score_func) for right in self.right]
+                    for left in self.left
+                ]
+            )
+
+            result = score_matrix(self.left, self.right, name)
+
+            self.assertEqual(expected.shape, result.shape)
+            np.testing.assert_allclose(expected, result)
+
+    def test_score_threshold(self):
+        for name in ["fuzzy_match", "intersection_vs_union"]:
+            expected = score_matrix(self.left, self.right, name)
+
+            statistics = Counter()
+            result = score_matrix(
+                self.left, self.right, name, score_threshold=0.5, statistics=statistics
+            )
+
+            np.testing.assert_array_equal(expected >= 0.5, result >= 0.5)
+            np.testing.assert_array_equal(expected[expected >= 0.5], result[result >= 0.5])
+            self.assertGreater(statistics[STATISTICS_PRUNED], 0)
+            if name == "fuzzy_match":
+                self.assertGreater(statistics[STATISTICS_LENGTH_PRUNED], 0)
+
+    def test_compare_terms_score_threshold(self):
+        for left in self.left:
+            for right in self.right:
+                expected = ComparableData.compare_terms(left, right, score_functions.fuzzy_match)
+                result = ComparableData.compare_terms(
+                    left, right, score_functions.fuzzy_match, score_threshold=0.5
+                )
+
+                if expected >= 0.5:
+                    self.assertEqual(expected, result)
+                else:
+                    self.assertLess(result, 0.5)
+
+    def test_empty(self):
+        result = score_matrix([], self.right, "fuzzy_match")
+        self.assertEqual((0, len(self.right)), result.shape)
+
+    def test_iter_score_blocks(self):
+        expected = score_matrix(self.left, self.right, "fuzzy_match")
+
+        result = np.zeros_like(expected)
+        for rows, columns, scores in iter_score_blocks(
+            self.left, self.right, "fuzzy_match", score_threshold=0.3, block_size=2
+        ):
+            result[rows, columns] = scores
+
+        np.testing.assert_array_equal(np.where(expected >= 0.3, expected, 0), result)
+
+    def test_iter_score_blocks_workers(self):
+        expected = list(
+            iter_score_blocks(
+                self.left, self.right, "fuzzy_match", score_threshold=0.3, block_size=1
+            )
+        )
+        result = list(
+            iter_score_blocks(
+                self.left, self.right, "fuzzy_match", score_threshold=0.3, block_size=1, workers=2
+            )
+        )
+
+        self.assertEqual(len(expected), len(result))
+        for expected_block, result_block in zip(expected, result):
+            for expected_array, result_array in zip(expected_block, result_block):
+                np.testing.assert_array_equal(expected_array, result_array)
+
+    def test_factorize(self):
+        uniques, codes = factorize([["a", "b"], "c", ["a", "b"], "c", ["b"]])
+
+        self.assertEqual([["a", "b"], "c", ["b"]], uniques)
+        self.assertEqual([0, 1, 0, 1, 2], list(codes))
@@ -0,0 +1,82 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy as np
+
+from napkon_string_matching.cache.backend import get_cache_backend
+from napkon_string_matching.compare.score_matrix import iter_score_blocks
+from napkon_string_matching.compare.score_store import ScoreStore, get_store_files
+from napkon_string_matching.tests.compare.test_score_matrix import (
+    COMP_VALUES_LEFT,
+    COMP_VALUES_RIGHT,
+)
+
+
+def score(left, right, store: ScoreStore | None = None):
+    pair_filters = []
+    if store is not None:
+        stored_pairs = store.get_pairs(left, right)
+        pair_filters.append(stored_pairs)
+
+    blocks = iter_score_blocks(
+        left, right, "fuzzy_match", score_threshold=0.3, block_size=2, pair_filters=pair_filters
+    )
+    if store is not None:
+        blocks = store.merge(blocks, stored_pairs, block_size=2)
+
+    left_rows, right_rows, scores = [np.concatenate(arrays) for arrays in zip(*blocks)]
+    order = np.lexsort((right_rows, left_rows))
+    return left_rows[order], right_rows[order], scores[order]
+
+
+class TestScoreStore(unittest.TestCase):
+    def assert_same(self, expected, result):
+        for expected_array, array in zip(expected, result):
+            np.testing.assert_array_almost_equal(expected_array, array)
+
+    def test_reuse(self):
+        store = ScoreStore()
+        expected = score(COMP_VALUES_LEFT, COMP_VALUES_RIGHT)
+        self.assert_same(expected, score(COMP_VALUES_LEFT, COMP_VALUES_RIGHT, store))
+        self.assert_same(expected, score(COMP_VALUES_LEFT, COMP_VALUES_RIGHT, store))
+        self.assertEqual(3, len(store.left))
+        self.assertEqual(4, len(store.right))
+
+        stored_pairs = store.get_pairs(COMP_VALUES_LEFT, COMP_VALUES_RIGHT)
+        self.assertFalse(stored_pairs.mask(np.arange(3), 4).any())
+
+    def test_changed_values(self):
+        store = ScoreStore()
+        score(COMP_VALUES_LEFT, COMP_VALUES_RIGHT, store)
+
+        # One value changed, one removed and the order changed
+        right = [COMP_VALUES_RIGHT[3], [["Körpergröße", "cm"]], COMP_VALUES_RIGHT[0]]
+        stored_pairs = store.get_pairs(COMP_VALUES_LEFT, right)
+        np.testing.assert_array_equal([True, False, True], stored_pairs.right_known)
+        self.assertTrue(stored_pairs.mask(np.arange(3), 3)[:, 1].all())
+
+        self.assert_same(score(COMP_VALUES_LEFT, right), score(COMP_VALUES_LEFT, right, store))
+        self.assertEqual(3, len(store.right))
+
+    def test_cache(self):
+        store = ScoreStore()
+        score(COMP_VALUES_LEFT, COMP_VALUES_RIGHT, store)
+
+        for cache_format in ["json", "parquet", "arrow"]:
+            with self.subTest(cache_format=cache_format), TemporaryDirectory() as directory:
+                backend = get_cache_backend(cache_format)
+                file = backend.path(Path(directory) / "scores")
+                store.write(file, backend)
+                self.assertTrue(all(path.exists() for path in get_store_files(file)))
+
+                result = ScoreStore.read(file, backend)
+                self.assertEqual(store.left, result.left)
+                self.assertEqual(store.right, result.right)
+                np.testing.assert_array_equal(store.left_rows, result.left_rows)
+                np.testing.assert_array_equal(store.right_rows, result.right_rows)
+                np.testing.assert_array_almost_equal(store.scores, result.scores)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+
+import numpy as np
+
+from napkon_string_matching.compare.threshold_sweep import sweep_thresholds
+
+
+class TestThresholdSweep(unittest.TestCase):
+    def test_counts(self):
+        result = sweep_thresholds([0.5, 0.9, 0.7, 0.7], [0.9, 0.7, 0.8, 1.0])
+
+        np.testing.assert_array_almost_equal([0.9, 0.7, 0.8, 1.0], result["Threshold"])
+        np.testing.assert_array_equal([1, 3, 1, 0], result["Results"])
+        self.assertNotIn("Precision", result.columns)
+
+    def test_single_precision(self):
+        # Scores are stored as single precision, as done by `CompactComparable`
+        result = sweep_thresholds(np.array([0.7], dtype=np.float32), [0.7])
+        np.testing.assert_array_equal([1], result["Results"])
+
+    def test_evaluation(self):
+        result = sweep_thresholds(
+            [0.9, 0.8, 0.6, 0.5],
+            [0.95, 0.85, 0.7, 0.5],
+            positive=[True, False, True, False],
+            negative=[False, True, False, False],
+            num_positive=4,
+        )
+
+        np.testing.assert_array_equal([0, 1, 1, 2], result["Validated"])
+        np.testing.assert_array_equal([0, 0, 1, 1], result["Excluded"])
+        np.testing.assert_array_almost_equal([np.nan, 1.0, 0.5, 2 / 3], result["Precision"])
+        np.testing.assert_array_almost_equal([0.0, 0.25, 0.25, 0.5], result["Recall"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,21 @@
+import unittest
+
+import numpy as np
+
+from napkon_string_matching.compare.token_index import TokenIndex
+
+
+class TestTokenIndex(unittest.TestCase):
+    def test_mask(self):
+        left = [["Diabetes", "Typ"], ["Asthma"], ["Größe"]]
+        right = [["diabetes", "mellitus", "Typ"], ["Asthma", "bronchiale"], ["Typ"]]
+
+        result = TokenIndex(left, right).mask(np.arange(3), 3)
+        np.testing.assert_array_equal(
+            [[True, False, True], [False, True, False], [False, False, False]], result
+        )
+
+        result = TokenIndex(left, right, min_shared_tokens=2).mask(np.arange(3), 3)
+        np.testing.assert_array_equal(
+            [[True, False, False], [False, False, False], [False, False, False]], result
+        )
@@ -0,0 +1,35 @@
+import unittest
+
+import numpy as np
+
+from napkon_string_matching.compare.top_k import TopK
+
+
+class TestTopK(unittest.TestCase):
+    def test_result(self):
+        best = TopK(2)
+        best.push(["a", "a", "b"], ["x", "y", "x"], [0, 0, 1], [0, 1, 0], [0.5, 0.7, 0.9])
+        best.push(["a", "b"], ["z", "y"], [0, 1], [2, 1], [0.6, 0.4])
+
+        left_rows, right_rows, scores = best.result()
+        np.testing.assert_array_equal([0, 1, 0, 1], left_rows)
+        np.testing.assert_array_equal([1, 0, 2, 1], right_rows)
+        np.testing.assert_array_equal([0.7, 0.9, 0.6, 0.4], scores)
+
+    def test_ties(self):
+        best = TopK(1)
+        best.push(["a", "a"], ["x", "y"], [0, 0], [0, 1], [0.5, 0.5])
+
+        _, right_rows, _ = best.result()
+        np.testing.assert_array_equal([0], right_rows)
+
+    def test_mutual(self):
+        best = TopK(1, mutual=True)
+        best.push(["a", "b", "b"], ["x", "x", "y"], [0, 1, 1], [0, 0, 1], [0.9, 0.8, 0.5])
+
+        left_rows, right_rows, _ = best.result()
+        np.testing.assert_array_equal([0], left_rows)
+        np.testing.assert_array_equal([0], right_rows)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, TopK, 0)
@@ -0,0 +1,138 @@
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import pandas as pd
+
+from napkon_string_matching.cache.backend import get_cache_backend
+from napkon_string_matching.types.comparable import CompactComparable
+
+
+class TestCompactComparable(unittest.TestCase):
+    def setUp(self) -> None:
+        self.comparable = CompactComparable(
+            left_name="Hap",
+            right_name="Pop",
+            left=pd.DataFrame(
+                {
+                    "HapIdentifier": ["l0", "l1"],
+                    "HapVariable": ["v0", "v1"],
+                    "HapSheet": ["s0", "s1"],
+                    "HapTerm": [["Anamnese", ["Diabetes", "Typ"]], ["Labor"]],
+                }
+            ),
+            right=pd.DataFrame(
+                {
+                    "PopIdentifier": ["r0", "r1", "r2"],
+                    "PopVariable": ["w0", "w1", "w2"],
+                    "PopSheet": ["t0", "t1", "t2"],
+                    "PopArgument": ["a0", "a1", "a2"],
+                }
+            ),
+            left_rows=[0, 1, 0],
+            right_rows=[2, 0, 1],
+            scores=[0.5, 0.7, 0.9],
+        )
+
+    def test_columns(self):
+        self.assertEqual(np.int32, self.comparable.left_rows.dtype)
+        self.assertEqual(np.float32, self.comparable.scores.dtype)
+
+        self.assertEqual(["l0", "l1", "l0"], self.comparable.match_identifier.tolist())
+        self.assertEqual(["w2", "w0", "w1"], self.comparable.variable.tolist())
+        self.assertEqual(
+            ["Anamnese:Diabetes:Typ", "Labor", "Anamnese:Diabetes:Typ"],
+            self.comparable.match_argument.tolist(),
+        )
+        self.assertEqual(["a2", "a0", "a1"], self.comparable.argument.tolist())
+
+    def test_dataframe_columns(self):
+        self.assertEqual(
+            [
+                "HapIdentifier",
+                "HapVariable",
+                "HapSheet",
+                "HapArgument",
+                "PopIdentifier",
+                "PopVariable",
+                "PopSheet",
+                "PopArgument",
+                "MatchScore",
+            ],
+            self.comparable.dataframe().columns.tolist(),
+        )
+
+    def test_missing_columns(self):
+        comparable = CompactComparable(
+            left_name="Gecco",
+            right_name="Pop",
+            left=pd.DataFrame({"GeccoIdentifier": ["g0"], "GeccoTerm": [["Labor"]]}),
+            right=self.comparable.right,
+            left_rows=[0, 0],
+            right_rows=[1, 2],
+            scores=[0.5, 0.7],
+        )
+
+        self.assertEqual(
+            ["GeccoIdentifier", "GeccoArgument", "PopIdentifier"],
+            comparable.dataframe().columns.tolist()[:3],
+        )
+        with self.assertRaises(KeyError):
+            comparable.match_sheet
+
+        with TemporaryDirectory() as directory:
+            backend = get_cache_backend("json")
+            file = backend.path(Path(directory) / "compared")
+
+            comparable.write_cache(file, backend)
+            result = CompactComparable.read_cache(file, backend)
+            pd.testing.assert_frame_equal(comparable.dataframe(), result.dataframe())
+
+    def test_filter_and_sort(self):
+        result = self.comparable.filter_score(0.7)
+        self.assertEqual(2, len(result))
+
+        result.sort_by_score()
+        self.assertEqual(["r1", "r0"], result.identifier.tolist())
+
+        result = self.comparable[[False, True, False]]
+        self.assertEqual(["l1"], result.match_identifier.tolist())
+
+    def test_exclude(self):
+        result = self.comparable.exclude(left=["l1"])
+        self.assertEqual(["r2", "r1"], result.identifier.tolist())
+
+        result = self.comparable.exclude(right=["r2"], pairs={("l0", "r1"), ("l1", "r2")})
+        self.assertEqual([("l1", "r0")], list(zip(result.match_identifier, result.identifier)))
+
+        self.assertEqual(3, len(self.comparable.exclude()))
+
+    def test_json(self):
+        result = CompactComparable(data=json.loads(self.comparable[[True, False, True]].to_json()))
+
+        self.assertEqual(1, len(result.left))
+        pd.testing.assert_frame_equal(
+            self.comparable[[True, False, True]].dataframe(), result.dataframe()
+        )
+
+    def test_empty(self):
+        result = self.comparable.filter_score(1.0)
+        self.assertTrue(result.empty)
+        self.assertEqual(9, len(result.dataframe().columns))
+
+        result = CompactComparable(data=json.loads(result.to_json()))
+        self.assertTrue(result.empty)
+
+    def test_cache(self):
+        for cache_format in ["json", "parquet"]:
+            with self.subTest(cache_format=cache_format), TemporaryDirectory() as directory:
+                backend = get_cache_backend(cache_format)
+                file = backend.path(Path(directory) / "compared")
+
+                self.comparable.write_cache(file, backend)
+                result = CompactComparable.read_cache(file, backend)
+
+                self.assertEqual("Hap", result.left_name)
+                pd.testing.assert_frame_equal(self.comparable.dataframe(), result.dataframe())
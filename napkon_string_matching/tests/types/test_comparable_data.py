@@ -0,0 +1,165 @@
+import unittest
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from napkon_string_matching.compare.score_matrix import iter_score_blocks
+from napkon_string_matching.types.comparable_data import (
+    ComparableData,
+    expand_unique_pairs,
+    flatten_list,
+    get_blocking_filter,
+    get_excluded_value_pairs,
+    remove_existing_mappings,
+)
+from napkon_string_matching.types.kds_definition import KdsDefinition
+from napkon_string_matching.types.mapping import Mapping
+from napkon_string_matching.types.questionnaire import Questionnaire
+
+
+class TestComparableData(unittest.TestCase):
+    def test_expand_unique_pairs(self):
+        # Rows 0 and 2 on the left and 1 and 2 on the right share the same value
+        left_codes = np.array([0, 1, 0])
+        right_codes = np.array([0, 1, 1])
+
+        left_rows, right_rows, scores = expand_unique_pairs(
+            np.array([0, 1]), np.array([1, 0]), np.array([0.9, 0.5]), left_codes, right_codes
+        )
+
+        self.assertEqual([0, 0, 1, 2, 2], list(left_rows))
+        self.assertEqual([1, 2, 0, 1, 2], list(right_rows))
+        self.assertEqual([0.9, 0.9, 0.5, 0.9, 0.9], list(scores))
+
+    def test_remove_existing_mappings(self):
+        left = Questionnaire({"Identifier": ["h1", "h2", "h3", "h4"]})
+        right = Questionnaire({"Identifier": ["p1", "p2", "p3"]})
+        whitelist = Mapping(
+            {
+                "1": {"hap": ["h1", "h2"], "pop": ["p1"]},
+                "2": {"hap": ["h3"], "suep": ["s3"]},
+                "3": {"pop": ["p3"], "suep": ["s3"]},
+                "4": {"gecco": ["g4"], "hap": ["h4"]},
+            }
+        )
+
+        remove_existing_mappings(left, right, "hap", "pop", whitelist)
+
+        self.assertEqual(["h3", "h4"], list(left["Identifier"]))
+        self.assertEqual(["p2", "p3"], list(right["Identifier"]))
+
+    def test_remove_existing_mappings_transitive(self):
+        left = Questionnaire({"Identifier": ["h1", "h2"]})
+        right = Questionnaire({"Identifier": ["p1", "p2"]})
+
+        # h1 and p1 are only connected through s1
+        whitelist = Mapping()
+        whitelist.update_values(
+            Mapping({"1": {"hap": ["h1"], "suep": ["s1"]}, "2": {"suep": ["s1"], "pop": ["p1"]}})
+        )
+
+        remove_existing_mappings(left, right, "hap", "pop", whitelist)
+
+        self.assertEqual(["h2"], list(left["Identifier"]))
+        self.assertEqual(["p2"], list(right["Identifier"]))
+
+    # Split into words to not depend on the tokenizer data of NLTK
+    @patch.object(
+        ComparableData,
+        "tokenize",
+        staticmethod(
+            lambda parts, language="german": sorted(set(" ".join(flatten_list(parts)).split()))
+        ),
+    )
+    def test_compare_cached_with_mappings(self):
+        # The identifiers of the KDS definition are compared in its `Variable` column
+        left = KdsDefinition(
+            {
+                "Identifier": ["k0", "k1", "k2", "k3"],
+                "Term": [["Diabetes Typ"], ["Diabetes"], ["Asthma Lunge"], ["Asthma"]],
+            }
+        )
+        right = Questionnaire(
+            {
+                "Identifier": ["h0", "h1", "h2"],
+                "Term": [["Diabetes Typ"], ["Asthma Lunge"], ["Asthma"]],
+            }
+        )
+        whitelist = Mapping({"1": {"kds": ["k1"], "hap": ["h0"]}})
+        blacklist = Mapping({"2": {"kds": ["k2"], "hap": ["h1"]}})
+
+        def compare(cached: bool, cache_dir: str) -> pd.DataFrame:
+            result = left.compare(
+                right,
+                whitelist,
+                blacklist,
+                compare_column="Term",
+                score_threshold=0.1,
+                score_func="fuzzy_match",
+                left_name="kds",
+                right_name="hap",
+                identifier_column_left="Variable",
+                cached=cached,
+                cache_dir=cache_dir,
+            )
+            return result.dataframe().sort_values(
+                ["KdsVariable", "HapIdentifier"], ignore_index=True
+            )
+
+        with TemporaryDirectory() as directory:
+            expected = compare(cached=False, cache_dir=directory)
+            self.assertNotIn("k1", expected["KdsVariable"].tolist())
+            self.assertNotIn(
+                ("k2", "h1"), list(zip(expected["KdsVariable"], expected["HapIdentifier"]))
+            )
+
+            # Written to and read from the cache
+            for _ in range(2):
+                pd.testing.assert_frame_equal(expected, compare(cached=True, cache_dir=directory))
+
+    def test_get_excluded_value_pairs(self):
+        # Left entries h1 and h2 share the same value
+        left_codes = np.array([0, 0, 1])
+        right_codes = np.array([0, 1])
+        excluded = {("h1", "p1"), ("h2", "p1"), ("h1", "p2"), ("h3", "p2")}
+
+        result = get_excluded_value_pairs(
+            pd.Series(["h1", "h2", "h3"]),
+            pd.Series(["p1", "p2"]),
+            left_codes,
+            right_codes,
+            excluded,
+        )
+
+        self.assertEqual(2, len(result))
+        np.testing.assert_array_equal(
+            [[False, True], [True, False]], result.mask(np.array([0, 1]), 2)
+        )
+
+    def test_token_blocking_recall(self):
+        # The least specific levels (0) share no tokens, the scored levels do
+        left = [
+            [["Größe"], ["Größe", "Patient", "cm"]],
+            [["Gewicht"], ["Gewicht", "Patient", "kg"]],
+            [["Asthma"], ["Asthma", "Lunge"]],
+        ]
+        right = [
+            [["Körpergröße"], ["Körpergröße", "Patient", "cm"]],
+            [["Körpergewicht"], ["Körpergewicht", "Patient", "kg"]],
+            [["Asthma", "bronchiale"], ["Asthma", "bronchiale", "Lunge"]],
+        ]
+
+        def score(pair_filters):
+            blocks = iter_score_blocks(
+                left, right, "fuzzy_match", score_threshold=0.4, pair_filters=pair_filters
+            )
+            return [np.concatenate(arrays) for arrays in zip(*blocks)]
+
+        expected = score([])
+        result = score([get_blocking_filter(left, right, {"method": "tokens"})])
+
+        self.assertEqual(5, len(expected[0]))
+        for expected_array, array in zip(expected, result):
+            np.testing.assert_array_equal(expected_array, array)
@@ -0,0 +1,38 @@
+import unittest
+
+from napkon_string_matching.types.data import Data
+from napkon_string_matching.types.questionnaire import Questionnaire
+
+
+class TestData(unittest.TestCase):
+    def test_fingerprint(self):
+        data = Data({"Identifier": ["1", "2"], "Term": [["a", ["b", "c"]], ["d"]]})
+        fingerprint = data.fingerprint()
+
+        self.assertEqual(
+            fingerprint,
+            Data({"Identifier": ["1", "2"], "Term": [["a", ["b", "c"]], ["d"]]}).fingerprint(),
+        )
+        self.assertNotEqual(
+            fingerprint,
+            Data({"Identifier": ["1", "2"], "Term": [["a", ["b"]], ["d"]]}).fingerprint(),
+        )
+        self.assertNotEqual(
+            fingerprint, Data({"Id": ["1", "2"], "Term": [["a", ["b", "c"]], ["d"]]}).fingerprint()
+        )
+
+        data["Identifier"] = ["1", "3"]
+        self.assertNotEqual(fingerprint, data.fingerprint())
+
+    def test_fingerprint_changed_in_place(self):
+        data = Questionnaire({"Identifier": ["1", "2", "3"], "Question": ["a", "b", "c"]})
+        fingerprint = data.fingerprint()
+
+        data.question = ["a", "b", "d"]
+        self.assertNotEqual(fingerprint, fingerprint := data.fingerprint())
+
+        data.drop(index=[0], inplace=True)
+        self.assertNotEqual(fingerprint, fingerprint := data.fingerprint())
+
+        data.sort_values(by="Question", ascending=False, inplace=True)
+        self.assertNotEqual(fingerprint, data.fingerprint())
@@ -0,0 +1,106 @@
+import unittest
+
+from napkon_string_matching.types.mapping import Mapping, MappingEntry
+
+
+class TestMapping(unittest.TestCase):
+    def test_fingerprint(self):
+        mapping = Mapping({"1": {"hap": ["h1", "h2"], "pop": ["p1"]}, "2": {"hap": ["h3"]}})
+        fingerprint = mapping.fingerprint()
+
+        # Ids and order of the mappings are not relevant
+        other = Mapping({"3": {"hap": ["h3"]}, "4": {"pop": ["p1"], "hap": ["h2", "h1"]}})
+        self.assertEqual(fingerprint, other.fingerprint())
+
+        mapping.add_mapping("hap", "h4", "pop", "p4")
+        self.assertNotEqual(fingerprint, mapping.fingerprint())
+
+    def test_index(self):
+        mapping = Mapping({"1": {"hap": ["h1", "h2"], "pop": ["p1"]}, "2": {"hap": ["h3"]}})
+        self.assertEqual("1", mapping.get_first_id("hap", "h2"))
+        self.assertIsNone(mapping.get_first_id("pop", "h2"))
+        self.assertIs(mapping.get_group("1"), mapping.get_mapping("hap", "h1", "pop", "p1"))
+        self.assertIsNone(mapping.get_mapping("hap", "h3", "pop", "p1"))
+
+        # Not all mappings contain the group
+        self.assertRaises(KeyError, mapping.filter_by_group, "pop")
+        self.assertRaises(KeyError, mapping.get_ids, "pop", "p1")
+
+        mapping.update_mapping("hap", "h3", "pop", "p3")
+        self.assertEqual(["2"], mapping.get_ids("pop", "p3"))
+        self.assertEqual({"1": ["p1"], "2": ["p3"]}, mapping.filter_by_group("pop"))
+
+        mapping.update(Mapping({"1": {"pop": ["p4"]}, "3": {"hap": ["h1"], "pop": ["p5"]}}))
+        self.assertEqual("1", mapping.get_first_id("pop", "p4"))
+        self.assertEqual(["1", "3"], mapping.get_ids("hap", "h1"))
+        self.assertEqual(
+            [("1", ["p1", "p4"]), ("2", ["p3"]), ("3", ["p5"])],
+            list(mapping.filter_by_group("pop").items()),
+        )
+
+        mapping.update_values(Mapping({"4": {"hap": ["h5"], "pop": ["p3"]}}))
+        self.assertEqual("2", mapping.get_first_id("hap", "h5"))
+
+        mapping.add_values(Mapping({"5": {"hap": ["h6"], "pop": ["p6"]}}))
+        self.assertIsNotNone(mapping.get_mapping("hap", "h6", "pop", "p6"))
+
+        mapping.set_group("2", MappingEntry({"hap": ["h7"]}))
+        self.assertIsNone(mapping.get_first_id("hap", "h3"))
+        self.assertEqual("2", mapping.get_first_id("hap", "h7"))
+
+    def test_update_values(self):
+        mapping = Mapping(
+            {"1": {"hap": ["h1"], "pop": ["p1"]}, "2": {"hap": ["h2"], "pop": ["p2"]}}
+        )
+        mapping.update_values(
+            Mapping(
+                {
+                    "3": {"pop": ["p3"], "suep": ["s3"]},
+                    "4": {"pop": ["p1"], "suep": ["s1"]},
+                    "5": {"suep": ["s1", "s3"], "hap": ["h2", "h1"]},
+                }
+            )
+        )
+
+        # All mappings are connected through shared identifiers
+        self.assertEqual(
+            {"1": {"hap": ["h1", "h2"], "pop": ["p1", "p2", "p3"], "suep": ["s3", "s1"]}},
+            mapping.dict(),
+        )
+        self.assertEqual("1", mapping.get_first_id("pop", "p3"))
+
+    def test_update_values_order(self):
+        entries = [
+            ("1", {"hap": ["h1"], "pop": ["p1"]}),
+            ("2", {"hap": ["h2"], "suep": ["s2"]}),
+            ("3", {"pop": ["p1"], "suep": ["s2"]}),
+            ("4", {"hap": ["h4"], "pop": ["p4"]}),
+        ]
+
+        results = []
+        for order in [entries, entries[::-1]]:
+            mapping = Mapping()
+            for id, entry in order:
+                mapping.update_values(Mapping({id: entry}))
+            results.append(
+                sorted(
+                    sorted((group, sorted(identifiers)) for group, identifiers in entry.items())
+                    for entry in mapping.dict().values()
+                )
+            )
+
+        self.assertEqual(2, len(results[0]))
+        self.assertEqual(results[0], results[1])
+
+    def test_add_values(self):
+        mapping = Mapping({"1": {"hap": ["h1"], "pop": ["p1"]}})
+        mapping.add_values(
+            Mapping(
+                {"2": {"hap": ["h1", "h2"], "pop": ["p1"]}, "3": {"hap": ["h2"], "pop": ["p3"]}}
+            )
+        )
+
+        # Mappings of non-matching entries are kept as pairs
+        self.assertEqual(3, len(mapping))
+        self.assertIsNotNone(mapping.get_mapping("hap", "h2", "pop", "p1"))
+        self.assertIsNone(mapping.get_mapping("hap", "h1", "pop", "p3"))
@@ -1,14 +1,16 @@
 import json
 import logging
 from enum import Enum
-from typing import Dict, List
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple
 
+import numpy as np
 import pandas as pd
 
+from napkon_string_matching.cache.backend import CacheBackend, get_side_file, get_side_files
 from napkon_string_matching.types.base.readable_json import ReadableJson
 from napkon_string_matching.types.base.writable_excel import WritableExcel
 from napkon_string_matching.types.base.writable_json import WritableJson
-from napkon_string_matching.types.data import Data
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +20,7 @@ class Columns(Enum):
     PARAMETER = "Parameter"
     VARIABLE = "Variable"
     SHEET = "Sheet"
+    TERM = "Term"
     MATCH_SCORE = "MatchScore"
 
 
@@ -33,120 +36,291 @@ COLUMN_NAMES = [
 LEFT_NAME = "left_name"
 RIGHT_NAME = "right_name"
 DATA_NAME = "data"
+LEFT_DATA_NAME = "left"
+RIGHT_DATA_NAME = "right"
+LEFT_ROWS_NAME = "left_rows"
+RIGHT_ROWS_NAME = "right_rows"
+SCORES_NAME = "scores"
 
 
-class Comparable(ReadableJson, WritableJson):
+class CompactComparable(ReadableJson, WritableJson):
     """
-    This class hold the information to be compared. In contrast to `ComparableData` this class only holds the data used during the comparison.
+    Holds the information of a comparison. Only holds the rows of the compared entries and their
+    scores while the columns of the entries are looked up in the source frames when they are
+    accessed.
+    The `Argument` column is generated from the `Term` column if the source frame has no such
+    column.
+
+    Attributes
+    ---
+        left_name (str):            prefix of the columns of the left entries
+        right_name (str):           prefix of the columns of the right entries
+        left (pd.DataFrame):        source frame of the left entries, using prefixed columns
+        right (pd.DataFrame):       source frame of the right entries, using prefixed columns
+        left_rows (np.ndarray):     positions in `left` of the compared entries
+        right_rows (np.ndarray):    positions in `right` of the compared entries
+        scores (np.ndarray):        scores of the compared entries
     """
-    left_name: str = None
-    right_name: str = None
-    data: Data = None
-
-    def __init__(self, data=None, left_name: str = None, right_name: str = None):
-        if left_name is not None and right_name is not None:
-            object.__setattr__(self, "left_name", left_name)
-            object.__setattr__(self, "right_name", right_name)
-            object.__setattr__(self, "data", Data(data))
-        elif LEFT_NAME in data and RIGHT_NAME in data and DATA_NAME in data:
-            object.__setattr__(self, "left_name", data[LEFT_NAME])
-            object.__setattr__(self, "right_name", data[RIGHT_NAME])
-            object.__setattr__(self, "data", Data(data[DATA_NAME]))
-        else:
-            raise AttributeError(
-                "Either provide 'left_name' AND 'right_name' or a dictionary in 'data' providing the "
-                f"entries {LEFT_NAME}, {RIGHT_NAME} AND {DATA_NAME}"
-            )
+
+    def __init__(
+        self,
+        data: Dict | None = None,
+        left_name: str | None = None,
+        right_name: str | None = None,
+        left: pd.DataFrame | None = None,
+        right: pd.DataFrame | None = None,
+        left_rows=None,
+        right_rows=None,
+        scores=None,
+    ):
+        if data is not None:
+            left_name = data[LEFT_NAME]
+            right_name = data[RIGHT_NAME]
+            left = pd.DataFrame(data[LEFT_DATA_NAME])
+            right = pd.DataFrame(data[RIGHT_DATA_NAME])
+            left_rows = data[DATA_NAME][LEFT_ROWS_NAME]
+            right_rows = data[DATA_NAME][RIGHT_ROWS_NAME]
+            scores = data[DATA_NAME][SCORES_NAME]
+
+        self.left_name = left_name
+        self.right_name = right_name
+        self.left = left
+        self.right = right
+        self.left_rows = np.asarray(left_rows if left_rows is not None else [], dtype=np.int32)
+        self.right_rows = np.asarray(right_rows if right_rows is not None else [], dtype=np.int32)
+        self.scores = np.asarray(scores if scores is not None else [], dtype=np.float32)
+
+    def _subset(self, rows) -> "CompactComparable":
+        return self.__class__(
+            left_name=self.left_name,
+            right_name=self.right_name,
+            left=self.left,
+            right=self.right,
+            left_rows=self.left_rows[rows],
+            right_rows=self.right_rows[rows],
+            scores=self.scores[rows],
+        )
+
+    def filter_score(self, score_threshold: float) -> "CompactComparable":
+        """
+        Get the entries with a score of at least `score_threshold`. Scores are stored as single
+        precision so the threshold is compared in the same precision.
+        """
+        return self._subset(self.scores >= np.float32(score_threshold))
+
+    def exclude(
+        self,
+        left: Iterable[str] | None = None,
+        right: Iterable[str] | None = None,
+        pairs: Set[Tuple[str, str]] | None = None,
+        identifier_column_left: str | None = None,
+        identifier_column_right: str | None = None,
+    ) -> "CompactComparable":
+        """
+        Get the entries without those having a left identifier in `left`, a right identifier in
+        `right` or a combination of both identifiers in `pairs`. The identifiers are taken from
+        the `identifier_column_left` and `identifier_column_right`, by default `Identifier`.
+        """
+        left_ids = self.get_column(identifier_column_left or Columns.IDENTIFIER.value, left=True)
+        right_ids = self.get_column(identifier_column_right or Columns.IDENTIFIER.value, left=False)
+
+        keep = ~(left_ids.isin(list(left or [])) | right_ids.isin(list(right or []))).to_numpy()
+        if pairs:
+            keep &= ~pd.MultiIndex.from_arrays([left_ids, right_ids]).isin(pairs)
+        return self._subset(keep)
+
+    def sort_by_score(self) -> None:
+        order = np.argsort(-self.scores, kind="stable")
+        self.left_rows = self.left_rows[order]
+        self.right_rows = self.right_rows[order]
+        self.scores = self.scores[order]
+
+    @property
+    def empty(self) -> bool:
+        return len(self) == 0
+
+    @property
+    def match_score(self) -> pd.Series:
+        return pd.Series(self.scores, name=Columns.MATCH_SCORE.value)
+
+    def _get_values(self, column: str, left: bool, rows: np.ndarray) -> np.ndarray:
+        frame, prefix = (self.left, self.left_name) if left else (self.right, self.right_name)
+        name = prefix + column
+
+        if name in frame:
+            return frame[name].to_numpy()[rows]
+        if column == QUESTION_OUTPUT and prefix + Columns.TERM.value in frame:
+            terms = frame[prefix + Columns.TERM.value].to_numpy()[rows]
+            return np.array([gen_question_output(term) for term in terms], dtype=object)
+        if not len(rows):
+            return np.array([], dtype=object)
+        raise KeyError(name)
+
+    def _get_columns(self, left: bool) -> List[str]:
+        """
+        Get the columns available for the entries of the left or right side in the order of the
+        source frame. `Argument` is added last if it is generated from `Term`.
+        """
+        frame, prefix = (self.left, self.left_name) if left else (self.right, self.right_name)
+        columns = [column.removeprefix(prefix) for column in frame.columns]
+
+        result = [column for column in columns if column != Columns.TERM.value]
+        if QUESTION_OUTPUT not in result and Columns.TERM.value in columns:
+            result.append(QUESTION_OUTPUT)
+        return result
+
+    def get_column(self, column: str, left: bool = True) -> pd.Series:
+        """
+        Get the values of the `column` for all entries of the left or right side
+        """
+        # Only get the values of each distinct row once
+        unique_rows, inverse = np.unique(
+            self.left_rows if left else self.right_rows, return_inverse=True
+        )
+        values = self._get_values(column, left, unique_rows)
+        return pd.Series(
+            values[inverse], name=(self.left_name if left else self.right_name) + column
+        )
+
+    def dataframe(self) -> pd.DataFrame:
+        columns = {
+            prefix + column: self.get_column(column, left=left)
+            for prefix, left in [(self.left_name, True), (self.right_name, False)]
+            for column in self._get_columns(left)
+            if column in COLUMN_NAMES
+        }
+        columns[Columns.MATCH_SCORE.value] = self.match_score
+        return pd.DataFrame(columns)
+
+    def to_excel(self, *args, **kwargs) -> None:
+        self.dataframe().to_excel(*args, **kwargs)
+
+    def _get_source(self, left: bool, rows: np.ndarray) -> pd.DataFrame:
+        prefix = self.left_name if left else self.right_name
+        return pd.DataFrame(
+            {
+                prefix + column: self._get_values(column, left, rows)
+                for column in self._get_columns(left)
+            }
+        )
+
+    def _get_referenced(self, left: bool) -> Tuple[pd.DataFrame, np.ndarray]:
+        """
+        Get the rows of the left or right source frame referenced by the entries and the
+        positions of the entries in these rows. Only these rows need to be stored.
+        """
+        rows, codes = np.unique(self.left_rows if left else self.right_rows, return_inverse=True)
+        return self._get_source(left, rows), codes.astype(np.int32)
 
     def to_json(self, orient: str | None = None, *args, **kwargs):
+        left_source, left_codes = self._get_referenced(left=True)
+        right_source, right_codes = self._get_referenced(left=False)
+
         result = {
             LEFT_NAME: self.left_name,
             RIGHT_NAME: self.right_name,
-            DATA_NAME: self.data.to_dict(orient=orient),
+            LEFT_DATA_NAME: left_source.to_dict(orient="list"),
+            RIGHT_DATA_NAME: right_source.to_dict(orient="list"),
+            DATA_NAME: {
+                LEFT_ROWS_NAME: left_codes.tolist(),
+                RIGHT_ROWS_NAME: right_codes.tolist(),
+                SCORES_NAME: self.scores.tolist(),
+            },
         }
         return json.dumps(result, *args, **kwargs)
 
-    def sort_by_score(self) -> None:
-        self._data.sort_values(by=Columns.MATCH_SCORE.value, ascending=False, inplace=True)
+    def write_cache(self, file_name: str | Path, backend: CacheBackend) -> None:
+        """
+        Write the result to cache files using the format of the `backend`. The rows and scores
+        are written to `file_name`, the referenced rows of the source frames to separate files.
 
-    def __getitem__(self, item):
-        result = self.data[item]
-        if isinstance(result, Data):
-            return self.__class__(data=result, left_name=self.left_name, right_name=self.right_name)
+        Attributes
+        ---
+            file_name (str|Path):   file path to write to
+            backend (CacheBackend): backend used to write the files
+        """
+        logger.info("write %i entries to cache file %s...", len(self), str(file_name))
+        file = Path(file_name)
+
+        left_source, left_codes = self._get_referenced(left=True)
+        right_source, right_codes = self._get_referenced(left=False)
+
+        pairs = pd.DataFrame(
+            {LEFT_ROWS_NAME: left_codes, RIGHT_ROWS_NAME: right_codes, SCORES_NAME: self.scores}
+        )
+        metadata = {LEFT_NAME: self.left_name, RIGHT_NAME: self.right_name}
+        backend.write(pairs, file, metadata=metadata)
+        backend.write(left_source, get_side_file(file, LEFT_DATA_NAME), key=file)
+        backend.write(right_source, get_side_file(file, RIGHT_DATA_NAME), key=file)
+        logger.info("...done")
+
+    @classmethod
+    def read_cache(cls, file_name: str | Path, backend: CacheBackend):
+        """
+        Read a result from cache files written by `write_cache`
+
+        Attributes
+        ---
+            file_name (str|Path):   file path to read from
+            backend (CacheBackend): backend used to read the files
+
+        Returns
+        ---
+            CompactComparable:  from the file contents
+        """
+        logger.info("read %s from cache file %s...", cls.__name__, str(file_name))
+        file = Path(file_name)
+
+        pairs, metadata = backend.read(file)
+        left, _ = backend.read(get_side_file(file, LEFT_DATA_NAME), key=file)
+        right, _ = backend.read(get_side_file(file, RIGHT_DATA_NAME), key=file)
+
+        result = cls(
+            left_name=metadata[LEFT_NAME],
+            right_name=metadata[RIGHT_NAME],
+            left=left,
+            right=right,
+            left_rows=pairs.get(LEFT_ROWS_NAME),
+            right_rows=pairs.get(RIGHT_ROWS_NAME),
+            scores=pairs.get(SCORES_NAME),
+        )
+        logger.info("...got %i entries", len(result))
         return result
 
+    def __getitem__(self, item):
+        if isinstance(item, str):
+            return self.dataframe()[item]
+        return self._subset(np.asarray(item))
+
     def __getattr__(self, name: str):
         name_parts = name.split("_")
-        if name_parts[-1].title() in COLUMN_NAMES:
-            if name_parts[0] == "match":
-                return self.data[self.left_name + name_parts[-1].title()]
-            else:
-                return self.data[self.right_name + name_parts[-1].title()]
-        elif name == Columns.MATCH_SCORE.name.lower():
-            return self.data[Columns.MATCH_SCORE.value]
-        else:
-            return getattr(self.data, name)
-
-    def __setattr__(self, name: str, value) -> None:
-        name_parts = name.split("_")
-        if name_parts[-1].title() in COLUMN_NAMES:
-            if name_parts[0] == "match":
-                self.data[self.left_name + name_parts[-1].title()] = value
-            else:
-                self.data[self.right_name + name_parts[-1].title()] = value
-        elif name == Columns.MATCH_SCORE.name.lower():
-            self.data[Columns.MATCH_SCORE.value] = value
-        else:
-            setattr(self.data, name, value)
+        if not name.startswith("_") and name_parts[-1].title() in COLUMN_NAMES:
+            return self.get_column(name_parts[-1].title(), left=name_parts[0] == "match")
+        raise AttributeError(name)
+
+    def __len__(self) -> int:
+        return len(self.scores)
 
     def __repr__(self) -> str:
-        return repr(self.data)
+        return repr(self.dataframe())
 
     def __str__(self) -> str:
-        return str(self.data)
-
-    def __eq__(self, __o: object) -> bool:
-        if not isinstance(__o, Comparable):
-            return False
-        return (
-            self.left_name == __o.left_name
-            and self.right_name == __o.right_name
-            and self.data.equals(__o.data)
-        )
-
-    def __len__(self) -> int:
-        return len(self.data)
-
-    def dropna(self, *args, **kwargs):
-        return self.__class__(
-            data=self._data.dropna(*args, **kwargs),
-            left_name=self.left_name,
-            right_name=self.right_name,
-        )
+        return str(self.dataframe())
 
-    def drop(self, *args, **kwargs):
-        return self.__class__(
-            data=self._data.drop(*args, **kwargs),
-            left_name=self.left_name,
-            right_name=self.right_name,
-        )
 
-    def merge(self, *args, **kwargs):
-        return self.__class__(
-            data=self._data.merge(*args, **kwargs),
-            left_name=self.left_name,
-            right_name=self.right_name,
-        )
+def get_cache_files(file: Path) -> List[Path]:
+    """
+    Get all files written by `CompactComparable.write_cache` to `file`
+    """
+    return get_side_files(file, LEFT_DATA_NAME, RIGHT_DATA_NAME)
 
-    def dataframe(self) -> pd.DataFrame:
-        return self.data.dataframe()
 
-    def drop_superfluous_columns(self, columns: List[str] = None) -> None:
-        self.data.drop_superfluous_columns(self.__column_names__ if columns is None else columns)
+def gen_question_output(term: List) -> str:
+    return ":".join(part for item in term for part in (item if isinstance(item, List) else [item]))
 
 
 class ComparisonResults(WritableExcel):
-    def __init__(self, comp_dict: Dict[str, Comparable] = None) -> None:
+    def __init__(self, comp_dict: Dict[str, CompactComparable] = None) -> None:
         self.results = comp_dict if comp_dict else {}
 
     def __setitem__(self, item, value):
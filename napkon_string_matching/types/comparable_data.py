@@ -1,20 +1,42 @@
 import logging
 from abc import abstractmethod
+from collections import Counter
 from enum import Enum
+from math import ceil
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Set, Tuple
 
 import nltk
+import numpy as np
 import pandas as pd
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
 from tqdm import tqdm
 
-import napkon_string_matching.compare.score_functions
-from napkon_string_matching.types.comparable import (COLUMN_NAMES,
-                                                     QUESTION_OUTPUT, Columns,
-                                                     Comparable)
-from napkon_string_matching.types.data import Data, gen_hash
+from napkon_string_matching.cache.artifacts import Artifact, ArtifactGraph
+from napkon_string_matching.cache.backend import get_cache_backend
+from napkon_string_matching.cache.manager import CacheManager
+from napkon_string_matching.compare import score_functions
+from napkon_string_matching.compare.minhash import DEFAULT_BANDS, DEFAULT_ROWS, MinHashIndex
+from napkon_string_matching.compare.pair_filters import CategoryPairs, ExcludedPairs, PairFilter
+from napkon_string_matching.compare.score_matrix import (
+    DEFAULT_BLOCK_SIZE,
+    DEFAULT_RECALL_SAMPLE_SIZE,
+    PRUNE_TOLERANCE,
+    STATISTICS_LENGTH_PRUNED,
+    STATISTICS_PRUNED,
+    estimate_recall,
+    factorize,
+    get_level,
+    iter_score_blocks,
+)
+from napkon_string_matching.compare.score_store import ScoreStore
+from napkon_string_matching.compare.token_index import TokenIndex
+from napkon_string_matching.compare.top_k import TopK
+from napkon_string_matching.types.comparable import (COLUMN_NAMES, Columns,
+                                                     CompactComparable,
+                                                     get_cache_files)
+from napkon_string_matching.types.data import Data, gen_hash, get_fingerprint
 from napkon_string_matching.types.mapping import Mapping
 
 nltk.download("punkt")
@@ -22,10 +44,18 @@ nltk.download("stopwords")
 
 
 PREPARE_REMOVE_SYMBOLS = "!?,.()[]:;*"
-CACHE_FILE_PATTERN = "compared__score_{}.json"
+CACHE_FILE_PATTERN = "compared__pairs_{}"
+SCORE_STORE_FILE_PATTERN = "scores__{}_{}_{}"
 
 COMP_COLUMN = "Compare"
 
+CONFIG_BLOCKING_METHOD = "method"
+CONFIG_BLOCKING_MIN_SHARED_TOKENS = "min_shared_tokens"
+CONFIG_BLOCKING_BANDS = "bands"
+CONFIG_BLOCKING_ROWS = "rows"
+CONFIG_BLOCKING_SEED = "seed"
+CONFIG_BLOCKING_RECALL_SAMPLE_SIZE = "recall_sample_size"
+
 logger = logging.getLogger(__name__)
 
 
@@ -45,6 +75,8 @@ class ComparableData(Data):
     __slots__ = [column.name.lower() for column in ComparableColumns]
     __column_mapping__ = {}
     __category_type__ = None
+    # Arguments of `read_original_format` the unprocessed data depends on
+    __source_kwargs__ = []
 
     @property
     def categories(self) -> List[str]:
@@ -59,10 +91,10 @@ class ComparableData(Data):
         return self.__category_type__(self._data, None)
 
     def _hash_compare_args(self, other, *args, **kwargs) -> str:
-        strings = [self.to_csv(), other.to_csv()]
+        strings = [self.fingerprint(), other.fingerprint()]
 
-        strings += [str(arg) for arg in args]
-        strings += [str(kwargs) for kwargs in kwargs.items()]
+        strings += [get_fingerprint(arg) for arg in args]
+        strings += [f"{key}={get_fingerprint(value)}" for key, value in sorted(kwargs.items())]
 
         return gen_hash("".join(strings))
 
@@ -78,37 +110,66 @@ class ComparableData(Data):
         cache_dir: str | Path | None = None,
         identifier_column_left: str | None = None,
         identifier_column_right: str | None = None,
+        cache_format: str | None = None,
+        cache_manager: CacheManager | None = None,
         *args,
         **kwargs,
-    ) -> Comparable:
+    ) -> CompactComparable:
+
+        # Removing pairs of the mappings does not change the scores of the others, so cached
+        # scores are independent of the mappings and these are applied afterwards. The best
+        # matches depend on the removed pairs, so with `top_k` these are removed before scoring
+        post_filter = cached and not kwargs.get("top_k")
+        whitelist, blacklist = (
+            (Mapping(), Mapping())
+            if post_filter
+            else (existing_mappings_whitelist, existing_mappings_blacklist)
+        )
 
         # Get the compare dataframe that holds the score to match all entries from
         # the left with each from right dataset
         df_hash = self._hash_compare_args(
             other=other,
-            existing_mappings_whitelist=existing_mappings_whitelist,
-            existing_mappings_blacklist=existing_mappings_blacklist,
+            existing_mappings_whitelist=whitelist,
+            existing_mappings_blacklist=blacklist,
             compare_column=compare_column,
             cache_threshold=cache_threshold,
+            score_func=kwargs.get("score_func"),
+            score_func_version=score_functions.VERSION,
+            filter_categories=kwargs.get("filter_categories"),
+            blocking=kwargs.get("blocking"),
+            top_k=kwargs.get("top_k"),
+            top_k_mutual=kwargs.get("top_k_mutual"),
         )
         cache_dir = Path(cache_dir if cache_dir else "cache")
-        cache_score_file = cache_dir / CACHE_FILE_PATTERN.format(df_hash)
+        cache_backend = get_cache_backend(cache_format, manager=cache_manager)
+        cache_score_file = cache_dir / (CACHE_FILE_PATTERN.format(df_hash) + cache_backend.suffix)
         logger.debug("cache hash %s", df_hash)
 
-        if cache_score_file.exists() and cached:
+        if cached and all(file.exists() for file in get_cache_files(cache_score_file)):
             logger.info("using cached result")
-            result = Comparable.read_json(cache_score_file)
+            result = CompactComparable.read_cache(cache_score_file, cache_backend)
         else:
             if not cache_threshold:
                 cache_threshold = score_threshold
+
+            # Scores of distinct comparison values are kept across runs, so only values of new
+            # or changed entries are scored if the datasets changed
+            store_file = cache_dir / (
+                get_score_store_name(compare_column, cache_threshold, **kwargs)
+                + cache_backend.suffix
+            )
+            score_store = ScoreStore.load(store_file, cache_backend) if cached else None
+
             result = self.gen_comparable(
                 other,
-                existing_mappings_whitelist=existing_mappings_whitelist,
-                existing_mappings_blacklist=existing_mappings_blacklist,
+                existing_mappings_whitelist=whitelist,
+                existing_mappings_blacklist=blacklist,
                 score_threshold=cache_threshold,
                 compare_column=compare_column,
                 identifier_column_left=identifier_column_left,
                 identifier_column_right=identifier_column_right,
+                score_store=score_store,
                 *args,
                 **kwargs,
             )
@@ -117,10 +178,25 @@ class ComparableData(Data):
                 cache_score_file.parent.mkdir(parents=True)
 
             logger.info("write cache to file")
-            result.write_json(cache_score_file)
+            result.write_cache(cache_score_file, cache_backend)
+            if score_store is not None:
+                score_store.write(store_file, cache_backend)
+
+        if post_filter:
+            result = remove_existing_pairs(
+                result,
+                self.dropna(subset=[compare_column]),
+                other.dropna(subset=[compare_column]),
+                kwargs.get("left_name"),
+                kwargs.get("right_name"),
+                existing_mappings_whitelist,
+                existing_mappings_blacklist,
+                identifier_column_left=identifier_column_left,
+                identifier_column_right=identifier_column_right,
+            )
 
         # Filter outside of the caching to reuse same cache with different thresholds
-        result = result[result.match_score >= score_threshold]
+        result = result.filter_score(score_threshold)
         logger.info("got %i filtered entries", len(result))
 
         result.sort_by_score()
@@ -144,10 +220,25 @@ class ComparableData(Data):
         filter_categories: bool = False,
         identifier_column_left: str | None = None,
         identifier_column_right: str | None = None,
+        block_size: int | None = None,
+        workers: int | None = None,
+        blocking: Dict | None = None,
+        top_k: int | None = None,
+        top_k_mutual: bool = False,
+        score_store: ScoreStore | None = None,
         *args,
         **kwargs,
-    ) -> Comparable:
-        score_func = getattr(napkon_string_matching.compare.score_functions, score_func)
+    ) -> CompactComparable:
+        """
+        Score all entries from the left with all entries from `right`. If `top_k` is given, only
+        the `top_k` best matches per left identifier are kept, with `top_k_mutual` they also have
+        to be among the `top_k` best matches of the right identifier.
+
+        If a `score_store` is given, only combinations of comparison values not in the store are
+        scored, the store is updated with the scores of the current values afterwards.
+        """
+        identifier_column_left = identifier_column_left or Columns.IDENTIFIER.value
+        identifier_column_right = identifier_column_right or Columns.IDENTIFIER.value
 
         left = self.dropna(subset=[compare_column])
         right = right.dropna(subset=[compare_column])
@@ -176,101 +267,217 @@ class ComparableData(Data):
         left[COMP_COLUMN] = [self.gen_comp_value(item) for item in left[compare_column]]
         right[COMP_COLUMN] = [self.gen_comp_value(item) for item in right[compare_column]]
 
-        left[QUESTION_OUTPUT] = [
-            ":".join(flatten_list(item)) for item in left[ComparableColumns.TERM.value]
-        ]
-        right[QUESTION_OUTPUT] = [
-            ":".join(flatten_list(item)) for item in right[ComparableColumns.TERM.value]
-        ]
-
         left_prefix = left_name.title()
         right_prefix = right_name.title()
 
-        left = left.add_prefix(left_prefix)
-        right = right.add_prefix(right_prefix)
-        compare_df = left.merge(right, how="cross")
-        logger.info("generated %s combination for comparision", "{:,}".format(len(compare_df)))
-
-        # Remove blacklisted comparisions
-        compare_df = remove_existing_mapping_from_df(
-            compare_df,
-            left_name,
-            right_name,
-            left_prefix,
-            right_prefix,
-            existing_mappings_blacklist,
-            identifier_column_right=identifier_column_right,
-            identifier_column_left=identifier_column_left,
+        # Entries with the same comparison value get the same scores, so each distinct value
+        # is only scored once. If filtering by categories, entries also need the same categories
+        left_values, left_codes = factorize(
+            list(zip(left[COMP_COLUMN], left[category_column]))
+            if filter_categories
+            else list(left[COMP_COLUMN])
+        )
+        right_values, right_codes = factorize(
+            list(zip(right[COMP_COLUMN], right[category_column]))
+            if filter_categories
+            else list(right[COMP_COLUMN])
         )
         logger.info(
-            "remaining %s entries after removing blacklisted ones", "{:,}".format(len(compare_df))
+            "got %i distinct comparison values left, %i right",
+            len(left_values),
+            len(right_values),
         )
 
+        blacklist = flatten_mapping(left_name, right_name, existing_mappings_blacklist)
+
+        # Combinations of values already evaluated are taken from the store. Otherwise do not
+        # score combinations of values if all their entries are blacklisted anyway, blacklisted
+        # combinations of single entries are removed after scoring. Stored scores have to be
+        # independent of the blacklist, so they are only removed after scoring.
+        value_filter = (
+            score_store.get_pairs(left_values, right_values)
+            if score_store is not None
+            else get_excluded_value_pairs(
+                left[identifier_column_left],
+                right[identifier_column_right],
+                left_codes,
+                right_codes,
+                blacklist,
+            )
+        )
+        pair_filters = [value_filter]
+
+        # Only compare entries within compatible categories
         if filter_categories:
-            previous_length = len(compare_df)
-            compare_df = categories_matching(
-                compare_df, left_prefix + category_column, right_prefix + category_column
+            pair_filters.append(
+                CategoryPairs(
+                    [categories for _, categories in left_values],
+                    [categories for _, categories in right_values],
+                )
+            )
+            left_values = [value for value, _ in left_values]
+            right_values = [value for value, _ in right_values]
+
+        if blocking_filter := get_blocking_filter(left_values, right_values, blocking):
+            pair_filters.append(blocking_filter)
+            recall = estimate_recall(
+                blocking_filter,
+                left_values,
+                right_values,
+                score_func,
+                score_threshold,
+                sample_size=blocking.get(
+                    CONFIG_BLOCKING_RECALL_SAMPLE_SIZE, DEFAULT_RECALL_SAMPLE_SIZE
+                ),
+                seed=blocking.get(CONFIG_BLOCKING_SEED, 0),
             )
             logger.info(
-                "filtered %s entries not matching categories, now %s",
-                "{:,}".format(previous_length - len(compare_df)),
-                "{:,}".format(len(compare_df)),
+                "estimated recall of %s blocking: %s",
+                blocking[CONFIG_BLOCKING_METHOD],
+                "{:.1%}".format(recall) if recall is not None else "no matches in sample",
             )
 
+        # The result only references the rows of the entries, only keep the columns needed for it
+        # and to remove existing mappings from it. `Argument` is generated from `Term` when the
+        # result is accessed
+        left_ids = left[identifier_column_left].to_numpy()
+        right_ids = right[identifier_column_right].to_numpy()
+        columns = [*COLUMN_NAMES, ComparableColumns.TERM.value]
+        left = left[
+            [column for column in left.columns if column in [*columns, identifier_column_left]]
+        ]
+        right = right[
+            [column for column in right.columns if column in [*columns, identifier_column_right]]
+        ]
+
+        left = left.add_prefix(left_prefix).reset_index(drop=True)
+        right = right.add_prefix(right_prefix).reset_index(drop=True)
+
         logger.info("calculate score")
-        comparable = Comparable(data=compare_df, left_name=left_prefix, right_name=right_prefix)
-
-        comparable.match_score = [
-            self.compare_terms(param, match_param, score_func)
-            for param, match_param in tqdm(
-                zip(
-                    comparable[left_prefix + COMP_COLUMN],
-                    comparable[right_prefix + COMP_COLUMN],
-                ),
-                total=len(comparable),
+        statistics = Counter()
+        blocks = []
+        blacklisted = 0
+        best = TopK(top_k, mutual=top_k_mutual) if top_k else None
+        block_size = block_size or DEFAULT_BLOCK_SIZE
+        value_blocks = iter_score_blocks(
+            left_values,
+            right_values,
+            score_func,
+            score_threshold=score_threshold,
+            block_size=block_size,
+            workers=workers,
+            statistics=statistics,
+            pair_filters=pair_filters,
+        )
+        if score_store is not None:
+            value_blocks = score_store.merge(value_blocks, value_filter, block_size)
+
+        for left_unique, right_unique, scores in tqdm(
+            value_blocks, total=ceil(len(left_values) / block_size)
+        ):
+            left_rows, right_rows, scores = expand_unique_pairs(
+                left_unique, right_unique, scores, left_codes, right_codes
             )
-        ]
 
-        # Remove not needed columns
-        logger.debug("remove superfluous columns")
-        columns = [
-            prefix + column for prefix in [left_prefix, right_prefix] for column in COLUMN_NAMES
-        ]
-        columns.append(Columns.MATCH_SCORE.value)
-        comparable.drop_superfluous_columns(columns)
+            # Remove blacklisted combinations of single entries
+            keep = ~pd.MultiIndex.from_arrays([left_ids[left_rows], right_ids[right_rows]]).isin(
+                blacklist
+            )
+            blacklisted += len(keep) - keep.sum()
+            left_rows, right_rows, scores = left_rows[keep], right_rows[keep], scores[keep]
+
+            if best:
+                best.push(left_ids[left_rows], right_ids[right_rows], left_rows, right_rows, scores)
+            else:
+                blocks.append((left_rows, right_rows, scores))
+
+        if best:
+            blocks = [best.result()]
+
+        left_rows, right_rows, scores = (
+            [np.concatenate(arrays) for arrays in zip(*blocks)] if blocks else [[], [], []]
+        )
+        comparable = CompactComparable(
+            left_name=left_prefix,
+            right_name=right_prefix,
+            left=left,
+            right=right,
+            left_rows=left_rows,
+            right_rows=right_rows,
+            scores=scores,
+        )
 
-        logger.info("apply score threshold")
-        comparable = comparable[comparable.match_score >= score_threshold]
-        logger.info("got %s entries", "{:,}".format(len(comparable)))
+        logger.info(
+            "kept %s combinations with a score of at least %s",
+            "{:,}".format(len(comparable)),
+            score_threshold,
+        )
+        if best:
+            logger.info(
+                "kept only the %i best %smatches per entry",
+                top_k,
+                "mutual " if top_k_mutual else "",
+            )
+        logger.info(
+            "skipped %s blacklisted combinations",
+            "{:,}".format(statistics[ExcludedPairs.name] + blacklisted),
+        )
+        if filter_categories:
+            logger.info(
+                "skipped %s combinations not matching categories",
+                "{:,}".format(statistics[CategoryPairs.name]),
+            )
+        if blocking_filter:
+            logger.info(
+                "skipped %s combinations not being candidates of %s blocking",
+                "{:,}".format(statistics[blocking_filter.name]),
+                blocking[CONFIG_BLOCKING_METHOD],
+            )
+        logger.info(
+            "skipped %s combinations that could not reach the threshold due to their lengths",
+            "{:,}".format(statistics[STATISTICS_LENGTH_PRUNED]),
+        )
+        logger.info(
+            "stopped scoring %s combinations early that could not reach the threshold",
+            "{:,}".format(statistics[STATISTICS_PRUNED]),
+        )
 
         return comparable
 
     @classmethod
-    def compare_terms(cls, left: List[str], right: List[str], score_func) -> float:
+    def compare_terms(
+        cls, left: List[str], right: List[str], score_func, score_threshold: float | None = None
+    ) -> float:
         """
         Calculate the score in an iterative way. The total score is calculated from the sum of sub-parts
         weightened from most to least specific. Means the most specific score is weightened with 0.5 and
         weight halfens from there on.
+
+        If `score_threshold` is given, the calculation stops as soon as the remaining levels cannot lift
+        the score up to the threshold anymore. The returned score is below the threshold but not exact.
         """
         score = 0
         len_left = len(left)
         len_right = len(right)
         left_max = len_left - 1
         right_max = len_right - 1
+        num_levels = max(len_left, len_right)
         factor = 1
-        for i in range(1, max(len_left, len_right) + 1):
+        for i in range(1, num_levels + 1):
             score_ = score_func(left[min(i, left_max)], right[min(i, right_max)])
             factor /= 2
             score += score_ * factor
+
+            # The remaining levels can at most add their weight
+            if (
+                score_threshold is not None
+                and score + factor - 0.5**num_levels < score_threshold - PRUNE_TOLERANCE
+            ):
+                break
         return score
 
     def remove_existing_mappings(self, existing_mappings) -> None:
-        self._data = self._data[
-            [
-                variable not in existing_mappings
-                for variable in self[ComparableColumns.IDENTIFIER.value]
-            ]
-        ]
+        self._data = self._data[~self[ComparableColumns.IDENTIFIER.value].isin(existing_mappings)]
 
     @abstractmethod
     def add_terms(self, language: str = "german"):
@@ -314,12 +521,19 @@ class ComparableData(Data):
         table_categories: Dict[str, List[str]] | None = None,
         use_cache=True,
         cache_dir: str | None = None,
+        cache_format: str | None = None,
+        cache_manager: CacheManager | None = None,
+        dependencies: List[str | Path] | None = None,
         *args,
         **kwargs,
     ):
         """
         Reads a questionnaire from file. If `calculate_tokens == True` tokens are also generated
-        using the provided preparator.
+        using the provided preparator. Cache files are written in the `cache_format` and tracked
+        by the `cache_manager`.
+
+        Cached files are only rebuilt if the content of their inputs or their configuration
+        changed. Besides `file_name`, the data may depend on further `dependencies` files.
         """
         if tokens is None:
             tokens = {}
@@ -328,6 +542,7 @@ class ComparableData(Data):
         logger.info(f"prepare file {file.name}")
 
         output_dir = Path(cache_dir if cache_dir else "cache")
+        cache_backend = get_cache_backend(cache_format, manager=cache_manager)
 
         # Build output file pattern
         file_pattern = ["prepared_", file.stem]
@@ -339,13 +554,13 @@ class ComparableData(Data):
         if "score_threshold" in tokens:
             file_pattern.append(str(tokens["score_threshold"]))
 
-        file_pattern.append("{}.json")
+        file_pattern.append("{}" + cache_backend.suffix)
 
         file_pattern = "_".join(file_pattern)
 
         # File names for all cache files
         # Order here is unprocessed -> terms -> prepared
-        unprocessed_file = output_dir / f"input__{file.stem}.json"
+        unprocessed_file = output_dir / f"input__{file.stem}{cache_backend.suffix}"
         terms_file = output_dir / file_pattern.format("terms")
         prepared_file = output_dir / file_pattern.format("prepared")
 
@@ -353,87 +568,62 @@ class ComparableData(Data):
         if use_cache and not output_dir.exists():
             output_dir.mkdir(parents=True)
 
-        data = cls._get_prepared_data(
-            file=file,
-            prepared_file=prepared_file,
-            terms_file=terms_file,
-            unprocessed_file=unprocessed_file,
-            tokens=tokens,
-            preparator=preparator,
-            use_cache=use_cache,
-            calculate_tokens=calculate_tokens,
-            table_categories=table_categories,
-            *args,
-            **kwargs,
-        )
-        return data
+        # Each file is only rebuilt if its inputs or configuration changed
+        def load(path: Path):
+            return cls.read_cache(path, cache_backend)
 
-    @classmethod
-    def _get_prepared_data(
-        cls,
-        prepared_file: Path,
-        preparator,
-        tokens: Dict,
-        use_cache: bool = True,
-        calculate_tokens: bool = False,
-        *args,
-        **kwargs,
-    ):
-        if use_cache and prepared_file.exists():
-            logger.info("using previously cached prepared file")
-            return cls.read_json(prepared_file)
-
-        data = cls._get_terms_data(use_cache=use_cache, *args, **kwargs)
-        if calculate_tokens:
-            config = {"score_threshold": 0.9, "timeout": 30, **tokens}
-            preparator.add_tokens(data, **config)
-            if use_cache:
-                data.write_json(prepared_file)
-            data.write_csv(prepared_file.with_suffix(".csv"))
-        return data
+        def save(data, path: Path) -> None:
+            data.write_cache(path, cache_backend)
 
-    @classmethod
-    def _get_terms_data(
-        cls,
-        terms_file: Path,
-        filter_column: str = None,
-        filter_prefix: str = None,
-        use_cache: bool = True,
-        *args,
-        **kwargs,
-    ):
-        # If term file exists read its data
-        if use_cache and terms_file.exists():
-            logger.info("using previously cached terms file")
-            return cls.read_json(terms_file)
+        unprocessed = Artifact(
+            target=unprocessed_file,
+            build=lambda: cls.read_original_format(
+                file_name=file, table_categories=table_categories, *args, **kwargs
+            ),
+            load=load,
+            save=save,
+            inputs=[file, *(dependencies or [])],
+            config={
+                "table_categories": table_categories,
+                **{name: kwargs.get(name) for name in cls.__source_kwargs__},
+            },
+        )
+        terms = Artifact(
+            target=terms_file,
+            build=lambda data: cls._gen_terms_data(data, filter_column, filter_prefix),
+            load=load,
+            save=save,
+            inputs=[unprocessed],
+            config={"filter_column": filter_column, "filter_prefix": filter_prefix},
+        )
+
+        graph = ArtifactGraph(use_cache=use_cache)
+        if not calculate_tokens:
+            return graph.get(terms)
+
+        config = {"score_threshold": 0.9, "timeout": 30, **tokens}
+        prepared = Artifact(
+            target=prepared_file,
+            build=lambda data: cls._gen_prepared_data(data, preparator, config, prepared_file),
+            load=load,
+            save=save,
+            inputs=[terms],
+            config=config,
+        )
+        return graph.get(prepared)
 
-        data = cls._get_unprocessed_file(use_cache=use_cache, *args, **kwargs)
+    @staticmethod
+    def _gen_prepared_data(data, preparator, config: Dict, prepared_file: Path):
+        preparator.add_tokens(data, **config)
+        data.write_csv(prepared_file.with_suffix(".csv"))
+        return data
 
+    @staticmethod
+    def _gen_terms_data(data, filter_column: str | None = None, filter_prefix: str | None = None):
         if filter_column and filter_prefix:
             data.filter(filter_column, filter_prefix)
 
-        # No matter if unprocessed data was read from cache or dataset file,
-        # the terms still needs to be generated
         data.add_terms()
-        if use_cache:
-            data.write_json(terms_file)
-        return data
-
-    @classmethod
-    def _get_unprocessed_file(
-        cls, unprocessed_file: Path, file: str, use_cache: bool = True, *args, **kwargs
-    ):
-        if use_cache and unprocessed_file.exists():
-            logger.info("using previously cached unprocessed file")
-            return cls.read_json(unprocessed_file)
-
-        data = cls.read_original_format(file_name=file, *args, **kwargs)
-
-        if data is None:
-            return None
-
-        if use_cache:
-            data.write_json(unprocessed_file)
         return data
 
     def filter(self, filter_column: str, filter_prefix: str):
@@ -449,45 +639,36 @@ class ComparableData(Data):
         )
         logger.debug("filtered %i entries", before_len - len(self))
 
-    def get_existing_mapping_ids(self, group_name: str, mappings: Mapping):
-        mappings_for_group = mappings.filter_by_group(group_name)
+    def get_existing_mapping_ids(self, group_name: str, mappings: Mapping) -> Set[str]:
+        """
+        Get the ids of the `mappings` containing any of the identifiers in group `group_name`
+        """
+        index = mappings.get_identifier_index(group_name)
         identifiers = self[Columns.IDENTIFIER.value]
-        ids = [
-            id
-            for id, mapping_identifiers in mappings_for_group.items()
-            for identifier in identifiers
-            if identifier in mapping_identifiers
-        ]
-        return list(set(ids))
+        mapped = identifiers[identifiers.isin(list(index))].unique()
+        return set().union(*(index[identifier] for identifier in mapped))
 
 
-def categories_matching(df: pd.DataFrame, column_left: str, column_right: str) -> pd.DataFrame:
-    first_row = df.iloc[0]
-    categories_left, categories_right = first_row[column_left], first_row[column_right]
-    if isinstance(categories_left, list):
-        if isinstance(categories_right, list):
-            matching_func = lambda x, y: (not set(x).isdisjoint(set(y))) or (not x and not y)
-        else:
-            matching_func = lambda x, y: x in set(y)
-    else:
-        if isinstance(categories_right, list):
-            matching_func = lambda x, y: x in set(y)
-        else:
-            matching_func = lambda x, y: x == y
-
-    logger.info("filtering categories...")
-    return df[
-        [
-            matching_func(*categories)
-            for categories in tqdm(
-                zip(
-                    df[column_left],
-                    df[column_right],
-                ),
-                total=len(df),
-            )
-        ]
-    ]
+def get_existing_identifiers(
+    left: ComparableData,
+    right: ComparableData,
+    left_name: str,
+    right_name: str,
+    existing_mappings: Mapping,
+) -> Tuple[List[str], List[str]]:
+    """
+    Get the identifiers of the mappings containing entries of both `left` and `right`
+    """
+    left_ids = left.get_existing_mapping_ids(left_name, existing_mappings)
+    right_ids = right.get_existing_mapping_ids(right_name, existing_mappings)
+
+    used_ids = left_ids.intersection(right_ids)
+    filtered_mappings = existing_mappings.get_filtered(used_ids)
+
+    return (
+        get_identifiers_from_mapping(filtered_mappings, left_name),
+        get_identifiers_from_mapping(filtered_mappings, right_name),
+    )
 
 
 def remove_existing_mappings(
@@ -497,20 +678,160 @@ def remove_existing_mappings(
     right_name: str,
     existing_mappings: Mapping,
 ):
-    try:
-        left_ids = left.get_existing_mapping_ids(left_name, existing_mappings)
-        right_ids = right.get_existing_mapping_ids(right_name, existing_mappings)
-    except KeyError:
-        return
+    left_identifiers, right_identifiers = get_existing_identifiers(
+        left, right, left_name, right_name, existing_mappings
+    )
+    if left_identifiers or right_identifiers:
+        left.remove_existing_mappings(left_identifiers)
+        right.remove_existing_mappings(right_identifiers)
+
+
+def remove_existing_pairs(
+    result: CompactComparable,
+    left: ComparableData,
+    right: ComparableData,
+    left_name: str,
+    right_name: str,
+    existing_mappings_whitelist: Mapping,
+    existing_mappings_blacklist: Mapping,
+    identifier_column_left: str | None = None,
+    identifier_column_right: str | None = None,
+) -> CompactComparable:
+    """
+    Remove the pairs covered by existing mappings from a `result` scored without them. Entries of
+    whitelisted mappings are removed as by `remove_existing_mappings` before scoring, blacklisted
+    pairs of entries are removed. The identifiers of the entries are taken from the same columns
+    as during scoring.
+    """
+    left_identifiers, right_identifiers = get_existing_identifiers(
+        left, right, left_name, right_name, existing_mappings_whitelist
+    )
+    blacklist = flatten_mapping(left_name, right_name, existing_mappings_blacklist)
+
+    filtered = result.exclude(
+        left_identifiers,
+        right_identifiers,
+        blacklist,
+        identifier_column_left=identifier_column_left,
+        identifier_column_right=identifier_column_right,
+    )
+    logger.info(
+        "removed %s combinations of existing mappings", "{:,}".format(len(result) - len(filtered))
+    )
+    return filtered
+
+
+def get_score_store_name(compare_column: str, score_threshold: float, **kwargs) -> str:
+    """
+    Get the name of the score store for a comparison. Stored scores are only valid for the same
+    datasets, compare column, score function, threshold and pair filters.
+    """
+    store_hash = gen_hash(
+        "".join(
+            get_fingerprint(value)
+            for value in [
+                compare_column,
+                score_threshold,
+                kwargs.get("score_func"),
+                score_functions.VERSION,
+                kwargs.get("filter_categories"),
+                kwargs.get("blocking"),
+            ]
+        )
+    )
+    return SCORE_STORE_FILE_PATTERN.format(
+        kwargs.get("left_name"), kwargs.get("right_name"), store_hash
+    )
+
+
+def expand_unique_pairs(
+    left_unique: np.ndarray,
+    right_unique: np.ndarray,
+    scores: np.ndarray,
+    left_codes: np.ndarray,
+    right_codes: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Expand pairs of unique values to all pairs of rows having these values. `left_codes`
+    and `right_codes` hold the index of the unique value for each row.
+    """
+    pairs = pd.DataFrame({"left": left_unique, "right": right_unique, "score": scores})
+    left_members = pd.DataFrame({"left": left_codes, "left_row": np.arange(len(left_codes))})
+    right_members = pd.DataFrame({"right": right_codes, "right_row": np.arange(len(right_codes))})
+
+    rows = pairs.merge(left_members, on="left").merge(right_members, on="right")
+    rows.sort_values(by=["left_row", "right_row"], inplace=True)
+
+    return rows["left_row"].values, rows["right_row"].values, rows["score"].values
 
-    used_ids = list(set(left_ids).intersection(right_ids))
-    filtered_mappings = existing_mappings.get_filtered(used_ids)
 
-    remove_identifiers = get_identifiers_from_mapping(filtered_mappings, left_name)
-    left.remove_existing_mappings(remove_identifiers)
+def get_excluded_value_pairs(
+    left_identifiers: pd.Series,
+    right_identifiers: pd.Series,
+    left_codes: np.ndarray,
+    right_codes: np.ndarray,
+    excluded: Set[Tuple[str, str]],
+) -> ExcludedPairs:
+    """
+    Get the combinations of distinct values for which all combinations of the entries sharing
+    these values are in `excluded`. `left_codes` and `right_codes` hold the index of the distinct
+    value for each entry.
+    """
+    excluded_df = pd.DataFrame(list(excluded), columns=["left_id", "right_id"])
+    left_rows = pd.DataFrame(
+        {
+            "left_id": np.asarray(left_identifiers),
+            "left": left_codes,
+            "left_row": np.arange(len(left_codes)),
+        }
+    )
+    right_rows = pd.DataFrame(
+        {
+            "right_id": np.asarray(right_identifiers),
+            "right": right_codes,
+            "right_row": np.arange(len(right_codes)),
+        }
+    )
 
-    remove_identifiers = get_identifiers_from_mapping(filtered_mappings, right_name)
-    right.remove_existing_mappings(remove_identifiers)
+    rows = excluded_df.merge(left_rows, on="left_id").merge(right_rows, on="right_id")
+    rows = rows.drop_duplicates(subset=["left_row", "right_row"])
+    counts = rows.groupby(["left", "right"]).size()
+
+    left, right = counts.index.get_level_values(0), counts.index.get_level_values(1)
+    num_pairs = np.bincount(left_codes)[left] * np.bincount(right_codes)[right]
+    complete = counts.values == num_pairs
+
+    return ExcludedPairs(np.asarray(left)[complete], np.asarray(right)[complete])
+
+
+def get_blocking_filter(
+    left_values: List[List[List[str]]], right_values: List[List[List[str]]], blocking: Dict | None
+) -> PairFilter | None:
+    """
+    Create the pair filter generating candidate pairs as configured in `blocking`
+    """
+    if not blocking:
+        return None
+
+    match blocking[CONFIG_BLOCKING_METHOD]:
+        case "tokens":
+            # Use the tokens of the most specific level that is scored
+            return TokenIndex(
+                get_level(left_values, 1),
+                get_level(right_values, 1),
+                min_shared_tokens=blocking.get(CONFIG_BLOCKING_MIN_SHARED_TOKENS, 1),
+            )
+        case "minhash":
+            # Use the level with the highest weight
+            return MinHashIndex(
+                get_level(left_values, 1),
+                get_level(right_values, 1),
+                bands=blocking.get(CONFIG_BLOCKING_BANDS, DEFAULT_BANDS),
+                rows=blocking.get(CONFIG_BLOCKING_ROWS, DEFAULT_ROWS),
+                seed=blocking.get(CONFIG_BLOCKING_SEED, 0),
+            )
+        case method:
+            raise ValueError(f"unknown blocking method '{method}'")
 
 
 def get_identifiers_from_mapping(mappings: Mapping, group: str) -> List[str]:
@@ -520,46 +841,14 @@ def get_identifiers_from_mapping(mappings: Mapping, group: str) -> List[str]:
     return result
 
 
-def remove_existing_mapping_from_df(
-    df: pd.DataFrame,
-    left_name: str,
-    right_name: str,
-    left_prefix: str,
-    right_prefix: str,
-    existing_mappings: Mapping,
-    identifier_column_left: str | None = None,
-    identifier_column_right: str | None = None,
-):
-    logger.info("remove black-listed entries...")
-    group_mappings_flat = flatten_mapping(left_name, right_name, existing_mappings)
-
-    if not identifier_column_left:
-        identifier_column_left = Columns.IDENTIFIER.value
-    if not identifier_column_right:
-        identifier_column_right = Columns.IDENTIFIER.value
-
-    # Calculate entries to return
-    maintain_rows = [
-        (left, right) not in group_mappings_flat
-        for left, right in tqdm(
-            zip(
-                df[left_prefix + identifier_column_left],
-                df[right_prefix + identifier_column_right],
-            ),
-            total=len(df),
-        )
-    ]
-    return df[maintain_rows]
-
-
-def flatten_mapping(left_group: str, right_group: str, mapping: Mapping) -> List[Tuple[str, str]]:
+def flatten_mapping(left_group: str, right_group: str, mapping: Mapping) -> Set[Tuple[str, str]]:
     group_mappings = mapping.get_all_mapping_for_groups(left_group, right_group)
 
-    group_mappings_flat = []
+    group_mappings_flat = set()
     for left_list, right_list in group_mappings:
         for left_entry in left_list:
             for right_entry in right_list:
-                group_mappings_flat.append((left_entry, right_entry))
+                group_mappings_flat.add((left_entry, right_entry))
 
     return group_mappings_flat
 
@@ -1,9 +1,14 @@
+import json
 import logging
 from hashlib import md5
+from inspect import ismethod
 from operator import getitem, setitem
-from typing import List
+from pathlib import Path
+from typing import Any, List
 
 import pandas as pd
+
+from napkon_string_matching.cache.backend import CacheBackend
 from napkon_string_matching.types.base.readable_json_frame import ReadableJsonFrame
 from napkon_string_matching.types.base.writable_csv import WritableCsv
 from napkon_string_matching.types.base.writable_excel import WritableExcel
@@ -13,7 +18,7 @@ logger = logging.getLogger(__name__)
 
 
 class Data(ReadableJsonFrame, WritableCsv, WritableJson, WritableExcel):
-    __slots__ = ["_data"]
+    __slots__ = ["_data", "_fingerprint"]
     __columns__ = []
 
     def __new__(cls, *args, **kwargs):
@@ -25,7 +30,7 @@ class Data(ReadableJsonFrame, WritableCsv, WritableJson, WritableExcel):
                 return lambda self: getitem(self._data, column)
 
             def setter_method(column=column.value):
-                return lambda self, value: setitem(self._data, column, value)
+                return lambda self, value: self.__setitem__(column, value)
 
             setattr(
                 cls,
@@ -46,7 +51,17 @@ class Data(ReadableJsonFrame, WritableCsv, WritableJson, WritableExcel):
             self._data = pd.DataFrame(data)
 
     def __getattr__(self, __name: str):
-        return getattr(self._data, __name)
+        attribute = getattr(self._data, __name)
+        if not ismethod(attribute):
+            return attribute
+
+        def method(*args, **kwargs):
+            # Methods of the frame may change it in place
+            if kwargs.get("inplace"):
+                self._fingerprint = None
+            return attribute(*args, **kwargs)
+
+        return method
 
     def __getitem__(self, val):
         result = self._data.__getitem__(val)
@@ -57,6 +72,7 @@ class Data(ReadableJsonFrame, WritableCsv, WritableJson, WritableExcel):
 
     def __setitem__(self, item, value):
         setitem(self._data, item, value)
+        self._fingerprint = None
 
     def __repr__(self) -> str:
         return repr(self._data)
@@ -71,9 +87,15 @@ class Data(ReadableJsonFrame, WritableCsv, WritableJson, WritableExcel):
         return len(self._data)
 
     def dropna(self, *args, **kwargs):
+        if kwargs.get("inplace"):
+            self._fingerprint = None
+            return self._data.dropna(*args, **kwargs)
         return self.__class__(self._data.dropna(*args, **kwargs))
 
     def drop(self, *args, **kwargs):
+        if kwargs.get("inplace"):
+            self._fingerprint = None
+            return self._data.drop(*args, **kwargs)
         return self.__class__(self._data.drop(*args, **kwargs))
 
     def merge(self, *args, **kwargs):
@@ -100,6 +122,95 @@ class Data(ReadableJsonFrame, WritableCsv, WritableJson, WritableExcel):
     def hash(self) -> str:
         return gen_hash(self._data.to_csv())
 
+    def write_cache(self, file_name: str | Path, backend: CacheBackend) -> None:
+        """
+        Write data to a cache file using the format of the `backend`
+
+        Attributes
+        ---
+            file_name (str|Path):   file path to write to
+            backend (CacheBackend): backend used to write the file
+        """
+        logger.info("write %i entries to cache file %s...", len(self), str(file_name))
+        backend.write(self._data, Path(file_name))
+        logger.info("...done")
+
+    @classmethod
+    def read_cache(cls, file_name: str | Path, backend: CacheBackend):
+        """
+        Read data from a cache file written by `write_cache`
+
+        Attributes
+        ---
+            file_name (str|Path):   file path to read from
+            backend (CacheBackend): backend used to read the file
+
+        Returns
+        ---
+            Self:  from the file contents
+        """
+        logger.info("read %s from cache file %s...", cls.__name__, str(file_name))
+        df, _ = backend.read(Path(file_name))
+
+        result = cls(data=df)
+        result.reset_index(drop=True, inplace=True)
+
+        logger.info("...got %i entries", len(result))
+        return result
+
+    def fingerprint(self) -> str:
+        """
+        Stable fingerprint of the content. It is memoized until the data is replaced or changed
+        through this object, i.e. by setting columns or properties or by methods called with
+        `inplace=True`. Values changed directly in the frame, e.g. through `loc`, are not noticed
+        unless the shape or the columns change.
+
+        Returns
+        ---
+            str:    fingerprint of the content
+        """
+        # The shape and columns are checked as well to notice changes of the frame itself
+        key = (self._data.shape, tuple(self._data.columns))
+        memo = getattr(self, "_fingerprint", None)
+        if memo is None or memo[0] is not self._data or memo[1] != key:
+            memo = (self._data, key, gen_frame_fingerprint(self._data))
+            self._fingerprint = memo
+        return memo[2]
+
 
 def gen_hash(string: str) -> str:
     return md5(string.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+def gen_frame_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Fingerprint of the columns and values of a frame based on vectorized hashes of the values.
+    Values that are not hashable by pandas like lists are hashed by their JSON representation.
+    """
+    header = json.dumps([[str(name), str(dtype)] for name, dtype in df.dtypes.items()])
+    fingerprint = md5(header.encode("utf-8"), usedforsecurity=False)
+
+    for _, column in df.items():
+        if column.dtype == object:
+            column = column.map(_stringify)
+        fingerprint.update(pd.util.hash_pandas_object(column, index=False).to_numpy().tobytes())
+
+    return fingerprint.hexdigest()
+
+
+def get_fingerprint(value: Any) -> str:
+    """
+    Fingerprint of `value` using its `fingerprint()` method if available or its JSON
+    representation otherwise
+    """
+    if callable(fingerprint := getattr(value, "fingerprint", None)):
+        return fingerprint()
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def _stringify(value: Any) -> Any:
+    if isinstance(value, (list, tuple, dict, set)):
+        return json.dumps(
+            sorted(value) if isinstance(value, set) else value, sort_keys=True, default=str
+        )
+    return value
@@ -22,11 +22,18 @@ class GeccoCombinedDefinition(Gecco83Definition, GeccoPlusDefinition):
     ):
         if file_name is not None and Path(file_name).exists():
             return GeccoDefinition.read_original_format(file_name)
-        gecco = Gecco83Definition.read_original_format(gecco83_file)
-        geccoplus = GeccoPlusDefinition.read_original_format(geccoplus_file)
-        result: GeccoDefinition = gecco.concat(geccoplus)
+        result = GeccoCombinedDefinition.read_excel_files(gecco83_file, geccoplus_file)
         if file_name is not None:
             result.write_json(file_name)
 
         result._extend_parameters()
         return result
+
+    @staticmethod
+    def read_excel_files(gecco83_file: str | Path, geccoplus_file: str | Path) -> GeccoDefinition:
+        """
+        Read the GECCO83 and GECCOplus definitions from their XLSX files and combine them
+        """
+        gecco = Gecco83Definition.read_original_format(gecco83_file)
+        geccoplus = GeccoPlusDefinition.read_original_format(geccoplus_file)
+        return gecco.concat(geccoplus)
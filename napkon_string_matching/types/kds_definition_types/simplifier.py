@@ -12,6 +12,8 @@ logger = logging.getLogger(__name__)
 
 
 class SimplifierKdsDefinition(KdsDefinition):
+    __source_kwargs__ = ["modules"]
+
     @classmethod
     def read_original_format(cls, file_name: str | Path, modules: List[str], *args, **kwargs):
         if Path(file_name).exists():
@@ -1,14 +1,53 @@
 import json
 import logging
-from typing import Dict, List, Tuple
+from itertools import combinations
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
 from uuid import uuid4
 
 from napkon_string_matching.types.base.readable_json import ReadableJson
 from napkon_string_matching.types.base.writable_json import WritableJson
+from napkon_string_matching.types.data import gen_hash
 
 logger = logging.getLogger(__name__)
 
 
+class DisjointSet:
+    """
+    Disjoint-set forest to find connected elements in near-linear time. Elements are added when
+    used the first time.
+    """
+    def __init__(self) -> None:
+        self._parents: Dict[Hashable, Hashable] = {}
+        self._sizes: Dict[Hashable, int] = {}
+
+    def find(self, element: Hashable) -> Hashable:
+        """
+        Get the representative of the set containing `element`
+        """
+        root = self._parents.setdefault(element, element)
+        while (parent := self._parents[root]) != root:
+            root = parent
+
+        # Compress the path to the root for later lookups
+        while element != root:
+            self._parents[element], element = root, self._parents[element]
+        return root
+
+    def union(self, first: Hashable, second: Hashable) -> None:
+        """
+        Join the sets containing `first` and `second`
+        """
+        first, second = self.find(first), self.find(second)
+        if first == second:
+            return
+
+        first_size, second_size = self._sizes.get(first, 1), self._sizes.get(second, 1)
+        if first_size < second_size:
+            first, second = second, first
+        self._parents[second] = first
+        self._sizes[first] = first_size + second_size
+
+
 class MappingEntry:
     """
     Mapping between entries from `DatasetTable`s or `GeccoDefinition`s that define the same concept.
@@ -75,13 +114,41 @@ class MappingEntry:
 class Mapping(ReadableJson, WritableJson):
     """
     Mapping between `DatasetTable`s or `GeccoDefinition`s
+
+    The ids of the mappings are indexed by group and identifier, so entries should only be changed
+    through this object to keep the index up to date.
     """
     def __init__(self, data: Dict[str, Dict[str, List[str]]] | None = None) -> None:
-        self._mappings: Dict[str, MappingEntry] = (
-            {key: MappingEntry(data=entry) for key, entry in data.items()}
-            if data is not None
-            else {}
-        )
+        self._clear()
+        if data is not None:
+            for key, entry in data.items():
+                self.set_group(key, MappingEntry(data=entry))
+
+    def _clear(self) -> None:
+        self._mappings: Dict[str, MappingEntry] = {}
+        # Ids per identifier of each group and the position of each id within the mappings
+        self._index: Dict[str, Dict[str, Set[str]]] = {}
+        self._positions: Dict[str, int] = {}
+        # Number of mappings per group they contain
+        self._group_counts: Dict[str, int] = {}
+        self._fingerprint: str | None = None
+
+    def fingerprint(self) -> str:
+        """
+        Stable fingerprint of the mapped identifiers independent of the ids and order of the
+        mappings. It is memoized until the mapping is changed through this object.
+
+        Returns
+        ---
+            str:    fingerprint of the content
+        """
+        if self._fingerprint is None:
+            content = sorted(
+                sorted((group, sorted(identifiers)) for group, identifiers in entry.dict().items())
+                for entry in self._mappings.values()
+            )
+            self._fingerprint = gen_hash(json.dumps(content))
+        return self._fingerprint
 
     def get_group_names(self) -> List[str]:
         result = set()
@@ -94,13 +161,63 @@ class Mapping(ReadableJson, WritableJson):
         return self._mappings.get(id)
 
     def set_group(self, id: str, value: MappingEntry) -> None:
+        if (existing := self._mappings.get(id)) is not None:
+            self._remove_from_index(id, existing)
+        else:
+            self._positions[id] = len(self._positions)
         self._mappings[id] = value
+        self._add_to_index(id, value)
+        self._fingerprint = None
+
+    def _add_to_index(self, id: str, entry: MappingEntry) -> None:
+        for group, identifiers in entry.dict().items():
+            self._group_counts[group] = self._group_counts.get(group, 0) + 1
+            group_index = self._index.setdefault(group, {})
+            for identifier in identifiers:
+                group_index.setdefault(identifier, set()).add(id)
+
+    def _remove_from_index(self, id: str, entry: MappingEntry) -> None:
+        for group, identifiers in entry.dict().items():
+            self._group_counts[group] -= 1
+            if not self._group_counts[group]:
+                del self._group_counts[group]
+            group_index = self._index[group]
+            for identifier in identifiers:
+                if (ids := group_index.get(identifier)) is not None:
+                    ids.discard(id)
+                    if not ids:
+                        del group_index[identifier]
+
+    def _add_identifier(self, id: str, group: str, identifier: str) -> None:
+        entry = self._mappings[id]
+        if entry.get(group) is None:
+            self._group_counts[group] = self._group_counts.get(group, 0) + 1
+        entry.add(group, identifier)
+        self._index.setdefault(group, {}).setdefault(identifier, set()).add(id)
+        self._fingerprint = None
+
+    def _check_group(self, group: str) -> None:
+        # Behaves like accessing the group in each of the mappings
+        if self._group_counts.get(group, 0) < len(self._mappings):
+            raise KeyError(group)
+
+    def _get_ids(self, group: str, identifier: str) -> Set[str]:
+        return self._index.get(group, {}).get(identifier, set())
+
+    def get_identifier_index(self, group: str) -> Dict[str, Set[str]]:
+        """
+        Get the ids of the mappings containing each identifier of `group`. The index is kept up
+        to date by this object and must not be changed.
+
+        Returns
+        ---
+            Dict[str, Set[str]]:    ids per identifier
+        """
+        return self._index.get(group, {})
 
     def mapping_for_identifier(self, group: str, identifier: str) -> MappingEntry | None:
-        for mapping in self._mappings.values():
-            if mapping.has(group, identifier):
-                return mapping
-        return None
+        id = self.get_first_id(group, identifier)
+        return self._mappings[id] if id is not None else None
 
     def add_mapping(
         self,
@@ -115,14 +232,9 @@ class Mapping(ReadableJson, WritableJson):
                 first_group, first_identifier, second_group, second_identifier
             )
         ) is None:
-            id = uuid4().hex
-
-            if id_reference:
-                if id_tmp := id_reference.get_first_id(first_group, first_identifier):
-                    id = id_tmp
-                elif id_tmp := id_reference.get_first_id(second_group, second_identifier):
-                    id = id_tmp
-
+            id = gen_mapping_id(
+                first_group, first_identifier, second_group, second_identifier, id_reference
+            )
             self.set_group(
                 id,
                 MappingEntry(
@@ -141,12 +253,12 @@ class Mapping(ReadableJson, WritableJson):
         second_identifier: str,
         id_reference=None,
     ) -> MappingEntry:
-        if (mapping := self.mapping_for_identifier(first_group, first_identifier)) is not None:
-            mapping.add(second_group, second_identifier)
-            return mapping
-        elif (mapping := self.mapping_for_identifier(second_group, second_identifier)) is not None:
-            mapping.add(first_group, first_identifier)
-            return mapping
+        if (id := self.get_first_id(first_group, first_identifier)) is not None:
+            self._add_identifier(id, second_group, second_identifier)
+            return self._mappings[id]
+        elif (id := self.get_first_id(second_group, second_identifier)) is not None:
+            self._add_identifier(id, first_group, first_identifier)
+            return self._mappings[id]
         else:
             return self.add_mapping(
                 first_group,
@@ -163,30 +275,23 @@ class Mapping(ReadableJson, WritableJson):
         second_group_name: str,
         second_identifier: str,
     ) -> MappingEntry | None:
-        for mappings in self._mappings.values():
-            if mappings.has(
-                first_group_name, first_identifier, second_group_name, second_identifier
-            ):
-                return mappings
-        return None
+        ids = self._get_ids(first_group_name, first_identifier).intersection(
+            self._get_ids(second_group_name, second_identifier)
+        )
+        return self._mappings[min(ids, key=self._positions.get)] if ids else None
 
     def filter_by_group(self, group_name: str) -> Dict[str, List[str]]:
-        return {
-            key: value[group_name] for key, value in self._mappings.items() if value[group_name]
-        }
+        self._check_group(group_name)
+        ids = set().union(*self.get_identifier_index(group_name).values())
+        return {id: self._mappings[id][group_name] for id in sorted(ids, key=self._positions.get)}
 
     def get_ids(self, group: str, identifier: str) -> List[str]:
-        return [
-            id
-            for id, mappings in self._mappings.items()
-            if (mapping := mappings[group]) and identifier in mapping
-        ]
+        self._check_group(group)
+        return sorted(self._get_ids(group, identifier), key=self._positions.get)
 
     def get_first_id(self, group: str, identifier: str) -> str | None:
-        for id, mappings in self._mappings.items():
-            if (mapping := mappings.get(group)) and identifier in mapping:
-                return id
-        return None
+        ids = self._get_ids(group, identifier)
+        return min(ids, key=self._positions.get) if ids else None
 
     def __iter__(self):
         return iter(self.items())
@@ -198,58 +303,73 @@ class Mapping(ReadableJson, WritableJson):
         return self._mappings.values()
 
     def get_filtered(self, ids: List[str]):
+        ids = set(ids)
         result = Mapping()
-        result._mappings = {id: value for id, value in self if id in ids}
+        for id, value in self:
+            if id in ids:
+                result.set_group(id, value)
         return result
 
     def update(self, other) -> None:
+        self._fingerprint = None
         for id, mapping in other.items():
             if id in self._mappings:
-                self.get_group(id).update(mapping)
+                for group, identifiers in mapping.dict().items():
+                    for identifier in identifiers:
+                        self._add_identifier(id, group, identifier)
             else:
-                self.set_group(id, mapping)
+                # Copy the entry to not change `other` without updating its index
+                entry = {group: list(identifiers) for group, identifiers in mapping.dict().items()}
+                self.set_group(id, MappingEntry(data=entry))
 
     def update_values(self, other) -> None:
-        for id, mapping in other.items():
-
-            # Find out if any of the entries is already present
-            existing_mapping = None
-            for group, identifiers in mapping._mappings.items():
+        """
+        Add the mappings of `other`. All mappings sharing an identifier, directly or through other
+        mappings, or sharing the same id are combined into one.
+        """
+        self._merge((id, mapping.dict()) for id, mapping in other.items())
+
+    def _merge(self, entries: Iterable[Tuple[str, Dict[str, List[str]]]]) -> None:
+        """
+        Combine the existing mappings and `entries` by connecting their groups and identifiers.
+        The result does not depend on the order in which mappings are merged, besides the ids:
+        each combined mapping gets the id of the first of its mappings, existing mappings first.
+        """
+        entries = [(id, mapping.dict()) for id, mapping in self.items()] + list(entries)
+
+        # Identifiers are nodes of the form (group, identifier), ids of the form (None, id)
+        components = DisjointSet()
+        for id, entry in entries:
+            for group, identifiers in entry.items():
                 for identifier in identifiers:
-                    if map := self.mapping_for_identifier(group, identifier):
-                        existing_mapping = map
-                        break
+                    components.union((None, id), (group, identifier))
 
-            if existing_mapping:
-                for group, identifiers in mapping._mappings.items():
-                    for identifier in identifiers:
-                        existing_mapping.add(group, identifier)
-            else:
-                self.update(Mapping(data={id: mapping.dict()}))
-
-    def add_values(self, other) -> None:
-        for id, mapping in other.items():
-            self._recursive_add(list(mapping._mappings.items()))
+        merged: Dict[Hashable, Tuple[str, Dict[str, Dict[str, None]]]] = {}
+        for id, entry in entries:
+            _, groups = merged.setdefault(components.find((None, id)), (id, {}))
+            for group, identifiers in entry.items():
+                groups.setdefault(group, {}).update(dict.fromkeys(identifiers))
 
-    def _recursive_add(self, mappings: List[Tuple[str, List[str]]]):
-        if len(mappings) > 2:
-            mapping = mappings.pop()
-            values_right = self._recursive_add(mappings)
-
-            group_left, mappings_left = mapping
-            values_left = [(group_left, entry) for entry in mappings_left]
-        else:
-            group_left, mappings_left = mappings[0]
-            group_right, mappings_right = mappings[1]
-
-            values_left = [(group_left, entry) for entry in mappings_left]
-            values_right = [(group_right, entry) for entry in mappings_right]
-
-        for gl, ml in values_left:
-            for gr, mr in values_right:
-                self.add_mapping(gl, ml, gr, mr)
+        self._clear()
+        for id, groups in merged.values():
+            self.set_group(
+                id,
+                MappingEntry(
+                    data={group: list(identifiers) for group, identifiers in groups.items()}
+                ),
+            )
 
-        return values_left + values_right
+    def add_values(self, other) -> None:
+        """
+        Add all combinations of identifiers of different groups within the mappings of `other`
+        as separate mappings, if not already present. Unlike `update_values` mappings are not
+        combined, as needed for mappings of entries that do not match.
+        """
+        for _, mapping in other.items():
+            for (group_left, left), (group_right, right) in combinations(mapping.dict().items(), 2):
+                for identifier_left in left:
+                    for identifier_right in right:
+                        self.add_mapping(group_left, identifier_left, group_right, identifier_right)
 
     def dict(self) -> Dict[str, Dict[str, List[str]]]:
         return {key: mapping.dict() for key, mapping in self._mappings.items()}
@@ -297,3 +417,22 @@ class Mapping(ReadableJson, WritableJson):
     def write_json(self, *args, **kwargs) -> None:
         logger.info("write %s", self.num_entries_repr())
         super().write_json(*args, **kwargs)
+
+
+def gen_mapping_id(
+    first_group: str,
+    first_identifier: str,
+    second_group: str,
+    second_identifier: str,
+    id_reference: Mapping | None = None,
+) -> str:
+    """
+    Generate the id of a new mapping between two identifiers. If one of the identifiers is part
+    of a mapping in `id_reference`, its id is used.
+    """
+    if id_reference:
+        if id := id_reference.get_first_id(first_group, first_identifier):
+            return id
+        elif id := id_reference.get_first_id(second_group, second_identifier):
+            return id
+    return uuid4().hex
@@ -6,7 +6,7 @@ from typing import List
 
 import pandas as pd
 
-from napkon_string_matching.types.mapping import Mapping
+from napkon_string_matching.types.mapping import Mapping, gen_mapping_id
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +30,7 @@ class MatchedMapping(Mapping):
         sheet_name_regex = re.compile(r"^(var_)?(?P<first>\w+)\svs\s(?P<second>\w+)$")
         sheet_names: List[str] = excel_file.sheet_names
         result = cls()
+        combined = []
         for sheet_name in sheet_names:
             sheet = excel_file.parse(sheet_name=sheet_name)
 
@@ -72,14 +73,20 @@ class MatchedMapping(Mapping):
                 ]
 
             if combine_entries:
-                for left, right in matches:
-                    result.update_mapping(
-                        name_left, left, name_right, right, id_reference=id_reference
+                combined.extend(
+                    (
+                        gen_mapping_id(name_left, left, name_right, right, id_reference),
+                        {name_left: [left], name_right: [right]},
                     )
+                    for left, right in matches
+                )
             else:
                 for left, right in matches:
                     result.add_mapping(name_left, left, name_right, right)
 
+        if combined:
+            result._merge(combined)
+
         logger.info("read %s", result.num_entries_repr())
 
         return result